@@ -14,6 +14,12 @@ class Settings(BaseSettings):
     ffmpeg_path: str = ""
     request_timeout: int = 30
     max_retries: int = 3
+    # Open pooled connections to frequently used platform hosts at startup
+    prewarm_connections: bool = True
+    # Shared HTTP/2 connection pool. Extractors fan out (endpoint races, per-format
+    # lookups), so keep enough idle connections per host to avoid fresh TLS handshakes.
+    http_max_connections: int = 128
+    http_max_keepalive_connections: int = 64
     user_agent: str = (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
         "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -26,6 +32,12 @@ class Settings(BaseSettings):
     vimeo_client_id: str = ""
     vimeo_client_secret: str = ""
 
+    # In-memory cache of successful extraction results (seconds; 0 disables).
+    # Requests made with platform cookies use the shorter cookie TTL.
+    response_cache_ttl: int = 300
+    response_cache_cookie_ttl: int = 60
+    response_cache_maxsize: int = 2048
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
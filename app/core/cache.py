@@ -0,0 +1,112 @@
+"""
+In-memory TTL cache shared across extractor instances.
+
+Extractors are created per request, so anything worth reusing between
+requests (whole extraction results, resolved short links, auth tokens)
+has to live at class or module level. TTLCache is a small LRU with
+per-entry expiry; get_or_load() adds single-flight loading so that
+concurrent misses on the same key share one upstream call instead of
+stampeding the platform.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    LRU cache with a per-entry time-to-live.
+
+    Expiry uses time.monotonic() so wall-clock changes do not affect it.
+    Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing/expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None):
+        """Store value under key. A non-positive ttl skips caching."""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value (expired entries count as missing)."""
+        value = self.get(key, _MISSING)
+        self._data.pop(key, None)
+        return default if value is _MISSING else value
+
+    def clear(self):
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float | Callable[[Any], float] | None = None,
+    ) -> Any:
+        """
+        Return the cached value for key, awaiting loader() on a miss.
+
+        Concurrent callers that miss on the same key wait for the first
+        caller's load rather than starting their own. Only successful
+        results are cached; an exception is propagated to every waiter.
+        ttl may be a callable taking the loaded value, for entries whose
+        lifetime is only known after loading (e.g. an expires_in field).
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark as retrieved so an exception nobody waited on isn't logged
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        self.set(key, value, ttl(value) if callable(ttl) else ttl)
+        future.set_result(value)
+        return value
@@ -65,6 +65,8 @@ class CookieManager:
         self._jars: dict[str, MozillaCookieJar] = {}
         self._raw_cookies: dict[str, dict[str, str]] = {}
         self._load_errors: dict[str, str] = {}
+        # Bumped on every in-memory change so callers can cache derived headers
+        self._generation = 0
         self._load_all()
 
     # ------------------------------------------------------------------
@@ -244,6 +246,11 @@ class CookieManager:
             return ""
         return "; ".join(f"{k}={v}" for k, v in cookies.items())
 
+    @property
+    def generation(self) -> int:
+        """Counter that changes whenever cookies are set, cleared or reloaded."""
+        return self._generation
+
     def get_load_errors(self) -> dict[str, str]:
         """Return a map of services that had load errors."""
         return dict(self._load_errors)
@@ -260,11 +267,13 @@ class CookieManager:
         if service not in self._raw_cookies:
             self._raw_cookies[service] = {}
         self._raw_cookies[service].update(cookies)
+        self._generation += 1
 
     def clear_cookies(self, service: str):
         """Remove all in-memory cookies for a service."""
         self._raw_cookies.pop(service, None)
         self._jars.pop(service, None)
+        self._generation += 1
 
     # ------------------------------------------------------------------
     # Reload
@@ -300,6 +309,7 @@ class CookieManager:
             self._raw_cookies.clear()
             self._load_errors.clear()
             self._load_all()
+        self._generation += 1
 
 
 # ------------------------------------------------------------------
@@ -10,6 +10,13 @@ Retry policy:
 - Respects Retry-After header on 429 responses.
 - Does NOT retry on 4xx client errors (except 429).
 
+Connection pooling:
+- Every HTTPClient sends requests through one process-wide HTTP/2
+  transport. Extractors create a client per request (each with its own
+  cookie jar), so sharing the transport is what lets keep-alive
+  connections and TLS sessions survive between extractions.
+- close_shared_transport() tears the pool down on application shutdown.
+
 Cookie handling:
 - Constructor accepts an initial cookie dict that is passed to the
   underlying httpx.AsyncClient.
@@ -20,13 +27,17 @@ Cookie handling:
 """
 
 import asyncio
+import importlib.util
 import logging
 import random
+from collections.abc import AsyncIterator, Iterable, Mapping
+from contextlib import asynccontextmanager
 from typing import Any
 
 import httpx
 
 from ..config import get_settings
+from ..utils.helpers import json_loads
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +47,11 @@ _MAX_BACKOFF = 30.0
 # HTTP status codes that trigger an automatic retry
 _RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
+# Content codings httpx can actually decode here. Advertising "br" without a
+# brotli package installed would get compressed bodies handed back undecoded.
+_HAS_BROTLI = bool(importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"))
+_ACCEPT_ENCODING = "gzip, deflate, br" if _HAS_BROTLI else "gzip, deflate"
+
 # User-Agent pool for rotation
 _USER_AGENTS = [
     (
@@ -74,6 +90,63 @@ _NETWORK_ERRORS = (
 )
 
 
+class _SharedTransport(httpx.AsyncHTTPTransport):
+    """HTTP/2 transport whose connection pool outlives the clients using it."""
+
+    async def aclose(self) -> None:
+        # Called by AsyncClient.aclose(); the pool is closed via shutdown()
+        pass
+
+    async def shutdown(self) -> None:
+        await super().aclose()
+
+
+_shared_transport: _SharedTransport | None = None
+
+
+def get_shared_transport() -> httpx.AsyncHTTPTransport:
+    """Return the process-wide pooled transport, creating it on first use."""
+    global _shared_transport
+    if _shared_transport is None:
+        settings = get_settings()
+        _shared_transport = _SharedTransport(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=30.0,
+            ),
+        )
+    return _shared_transport
+
+
+async def close_shared_transport():
+    """Close all pooled connections (application shutdown)."""
+    global _shared_transport
+    if _shared_transport is not None:
+        await _shared_transport.shutdown()
+        _shared_transport = None
+
+
+async def prewarm_connections(urls: Iterable[str], timeout: float = 5.0):
+    """
+    Open pooled connections to the given origins ahead of first use.
+
+    Best-effort: failures are logged at debug level and otherwise ignored.
+    """
+    urls = list(urls)
+    if not urls:
+        return
+    async with httpx.AsyncClient(transport=get_shared_transport(), timeout=timeout) as client:
+        results = await asyncio.gather(
+            *(client.head(url) for url in urls),
+            return_exceptions=True,
+        )
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            logger.debug("Connection pre-warm failed for %s: %s", url, result)
+
+
 class HTTPClient:
     """
     Async HTTP client with retry logic, cookie jar support and
@@ -103,7 +176,7 @@ class HTTPClient:
                     "q=0.9,image/avif,image/webp,*/*;q=0.8"
                 ),
                 "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate, br",
+                "Accept-Encoding": _ACCEPT_ENCODING,
                 "DNT": "1",
                 "Connection": "keep-alive",
                 "Upgrade-Insecure-Requests": "1",
@@ -137,12 +210,7 @@ class HTTPClient:
                 follow_redirects=self._follow_redirects,
                 headers=self._default_headers,
                 cookies=self._cookies,
-                http2=True,
-                limits=httpx.Limits(
-                    max_connections=50,
-                    max_keepalive_connections=10,
-                    keepalive_expiry=30.0,
-                ),
+                transport=get_shared_transport(),
             )
         return self._client
 
@@ -172,7 +240,7 @@ class HTTPClient:
         method: str,
         url: str,
         *,
-        headers: dict[str, str] | None = None,
+        headers: Mapping[str, str] | None = None,
         params: dict[str, str] | None = None,
         data: Any = None,
         json: Any = None,
@@ -306,6 +374,57 @@ class HTTPClient:
     async def head(self, url: str, **kwargs) -> httpx.Response:
         return await self.request("HEAD", url, **kwargs)
 
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        params: dict[str, str] | None = None,
+        cookies: dict[str, str] | None = None,
+        follow_redirects: bool | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Open a streaming request; the body is read by the caller
+        (aiter_bytes/aiter_text/aiter_lines) and may be abandoned early.
+
+        HTTP 429 / 5xx responses are retried with the same back-off as
+        request(), since no body has been handed over yet. Nothing is
+        retried once the caller starts consuming the body.
+        """
+        client = await self._get_client()
+        for attempt in range(self._max_retries + 1):
+            async with client.stream(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                cookies=cookies,
+                follow_redirects=(
+                    follow_redirects if follow_redirects is not None else self._follow_redirects
+                ),
+                timeout=timeout,
+            ) as response:
+                if (
+                    response.status_code not in _RETRYABLE_STATUS_CODES
+                    or attempt == self._max_retries
+                ):
+                    yield response
+                    return
+                wait = self._backoff(attempt, response)
+                logger.warning(
+                    "HTTP %d from streamed %s %s (attempt %d/%d). Retrying in %.1fs...",
+                    response.status_code,
+                    method,
+                    url,
+                    attempt + 1,
+                    self._max_retries + 1,
+                    wait,
+                )
+            await asyncio.sleep(wait)
+
     async def get_text(self, url: str, **kwargs) -> str:
         """GET request returning response text."""
         response = await self.get(url, **kwargs)
@@ -316,13 +435,13 @@ class HTTPClient:
         """GET request returning parsed JSON."""
         response = await self.get(url, **kwargs)
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content)
 
     async def post_json(self, url: str, **kwargs) -> Any:
         """POST request returning parsed JSON."""
         response = await self.post(url, **kwargs)
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content)
 
     async def resolve_redirect(self, url: str) -> str:
         """Follow redirects and return the final URL.
@@ -5,6 +5,7 @@ Each extractor handles URL matching, API interaction, format extraction,
 and metadata collection for a specific platform.
 """
 
+from ..core.http_client import prewarm_connections
 from ..models.enums import Platform
 from .base import BaseExtractor, ExtractionError
 
@@ -43,7 +44,15 @@ def _load_extractors() -> dict[Platform, type[BaseExtractor]]:
 
 
 def get_extractor(platform: Platform) -> BaseExtractor:
-    """Get an extractor instance for the given platform."""
+    """
+    Get an extractor instance for the given platform.
+
+    Instances are per request on purpose: they hold request-scoped state
+    (cookie-bound HTTP client, per-user tokens) and extract() closes their
+    client. What is worth sharing is shared underneath them instead: the
+    HTTP/2 connection pool (get_shared_transport), class-level token and
+    redirect caches, and the response cache.
+    """
     global _EXTRACTOR_MAP
     if _EXTRACTOR_MAP is None:
         _EXTRACTOR_MAP = _load_extractors()
@@ -55,4 +64,14 @@ def get_extractor(platform: Platform) -> BaseExtractor:
     return extractor_class()
 
 
-__all__ = ["BaseExtractor", "ExtractionError", "get_extractor"]
+async def prewarm_extractor_connections():
+    """Pre-warm the shared connection pool for extractors that declare hosts."""
+    global _EXTRACTOR_MAP
+    if _EXTRACTOR_MAP is None:
+        _EXTRACTOR_MAP = _load_extractors()
+
+    urls = [url for cls in _EXTRACTOR_MAP.values() for url in cls._prewarm_urls]
+    await prewarm_connections(urls)
+
+
+__all__ = ["BaseExtractor", "ExtractionError", "get_extractor", "prewarm_extractor_connections"]
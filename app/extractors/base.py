@@ -3,12 +3,18 @@ Base extractor class that all platform-specific extractors inherit from.
 Ported from yt-dlp's InfoExtractor base class patterns.
 """
 
+import asyncio
 import json
 import logging
 import re
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Mapping
 from typing import Any
 
+import httpx
+
+from ..config import get_settings
+from ..core.cache import TTLCache
 from ..core.cookies import CookieManager, get_cookie_manager
 from ..core.http_client import HTTPClient
 from ..models.enums import FormatType, Platform, Quality
@@ -17,9 +23,29 @@ from ..models.response import (
     ExtractResponse,
     FormatInfo,
 )
+from ..utils.helpers import int_or_none
 
 logger = logging.getLogger(__name__)
 
+# _download_webpage_until: stop reading a page without a match after this
+# many characters, and rescan this much of the previous text with each chunk
+_STREAM_MAX_CHARS = 1_000_000
+_STREAM_SEARCH_OVERLAP = 4096
+
+# Process-wide cache of raw _extract() results, shared by all extractors
+_response_cache: TTLCache | None = None
+
+
+def _get_response_cache() -> TTLCache:
+    global _response_cache
+    if _response_cache is None:
+        settings = get_settings()
+        _response_cache = TTLCache(
+            maxsize=settings.response_cache_maxsize,
+            ttl=settings.response_cache_ttl,
+        )
+    return _response_cache
+
 
 class ExtractionError(Exception):
     """Raised when media extraction fails."""
@@ -43,6 +69,14 @@ class BaseExtractor(ABC):
 
     platform: Platform
 
+    # Seconds a successful extraction may be served from the response cache.
+    # None (default) disables caching for the platform; the effective TTL is
+    # further capped by the RESPONSE_CACHE_* settings.
+    _response_cache_ttl: float | None = None
+
+    # Origins to open pooled connections to at startup (see prewarm_connections)
+    _prewarm_urls: tuple[str, ...] = ()
+
     def __init__(self):
         self._http: HTTPClient | None = None
         self._cookies: CookieManager = get_cookie_manager()
@@ -78,7 +112,7 @@ class BaseExtractor(ABC):
             params: Additional URL-matched parameters (user, subreddit, etc.)
         """
         try:
-            response = await self._extract(media_id, url, request, params or {})
+            response = await self._extract_cached(media_id, url, request, params or {})
 
             # Post-process formats
             if response.formats:
@@ -105,6 +139,67 @@ class BaseExtractor(ABC):
         finally:
             await self.close()
 
+    async def _extract_cached(
+        self,
+        media_id: str,
+        url: str,
+        request: ExtractRequest,
+        params: dict[str, str],
+    ) -> ExtractResponse:
+        """
+        Run _extract() through the shared response cache.
+
+        Concurrent requests for the same key are coalesced into a single
+        extraction. Callers always get a deep copy, since extract()
+        post-processes (mutates) the response it returns.
+        """
+        ttl = self._get_response_cache_ttl()
+        key = self._response_cache_key(media_id, url, request, params) if ttl else None
+        if key is None:
+            return await self._extract(media_id, url, request, params)
+
+        cached = await _get_response_cache().get_or_load(
+            key,
+            lambda: self._extract(media_id, url, request, params),
+            ttl=ttl,
+        )
+        return cached.model_copy(deep=True)
+
+    def _get_response_cache_ttl(self) -> float:
+        """Effective response cache TTL in seconds (0 = do not cache)."""
+        if not self._response_cache_ttl:
+            return 0
+        settings = get_settings()
+        ttl = min(self._response_cache_ttl, settings.response_cache_ttl)
+        if self._has_cookies():
+            ttl = min(ttl, settings.response_cache_cookie_ttl)
+        return max(ttl, 0)
+
+    def _response_cache_key(
+        self,
+        media_id: str,
+        url: str,
+        request: ExtractRequest,
+        params: dict[str, str],
+    ) -> tuple | None:
+        """
+        Cache key for an extraction, or None to bypass the cache.
+
+        Includes everything that can change what _extract() returns for
+        the same media ID (URL params such as the uploader, cookie state,
+        password, rendition opt-ins). Some patterns only identify an item
+        by media ID and params together (e.g. SoundCloud user + slug).
+        """
+        return (
+            self.platform.value,
+            media_id,
+            tuple(sorted(params.items())),
+            self._has_cookies(),
+            request.password,
+            request.all_qualities,
+            request.include_sizes,
+        )
+
     @abstractmethod
     async def _extract(
         self,
@@ -251,10 +346,118 @@ class BaseExtractor(ABC):
             http_headers=http_headers,
         )
 
+    async def _probe_filesizes(self, formats: list[FormatInfo], **kwargs):
+        """
+        Fill in filesize from Content-Length with concurrent HEAD requests.
+
+        Only for direct (non-HLS/DASH) URLs. Best-effort: formats whose
+        probe fails or reports no length are left unchanged.
+        """
+        targets = [
+            f for f in formats if f.filesize is None and f.protocol in (None, "http", "https")
+        ]
+        responses = await asyncio.gather(
+            *(self.http.head(f.url, **kwargs) for f in targets),
+            return_exceptions=True,
+        )
+        for fmt, response in zip(targets, responses):
+            if isinstance(response, Exception):
+                logger.debug(f"HEAD for {fmt.format_id} failed: {response}")
+            elif response.status_code == 200:
+                fmt.filesize = int_or_none(response.headers.get("content-length"))
+
+    async def _first_result(
+        self,
+        coros: Mapping[str, Awaitable[Any]],
+        accept: Callable[[Any], Any] = lambda result: result,
+    ) -> Any:
+        """
+        Run the labelled coroutines concurrently and return the first
+        truthy accept(result), cancelling the ones still running.
+
+        A coroutine that raises is logged under its label and skipped.
+        Returns None if no result is accepted.
+        """
+        tasks = {asyncio.ensure_future(coro): label for label, coro in coros.items()}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        value = accept(task.result())
+                    except Exception as e:
+                        logger.debug(f"{self.platform.value} {tasks[task]} failed: {e}")
+                        continue
+                    if value:
+                        return value
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _resolve_short_link(self, url: str, expected: re.Pattern[str]) -> str:
+        """
+        Follow a short link and return the final URL.
+
+        HTTPClient returns error responses instead of raising, so a 429, a
+        5xx or a login interstitial would otherwise look like a resolved
+        link. Raises ExtractionError unless the final response is 2xx and
+        its URL matches expected, which makes the result safe to cache.
+        HEAD is tried first; GET is used if HEAD fails or lands elsewhere.
+        """
+        try:
+            response = await self.http.head(url, follow_redirects=True)
+        except httpx.HTTPError as e:
+            logger.debug(f"HEAD for short link {url} failed: {e}")
+            response = None
+        if response is None or not response.is_success or not expected.search(str(response.url)):
+            response = await self.http.get(url, follow_redirects=True)
+
+        final_url = str(response.url)
+        if not response.is_success or not expected.search(final_url):
+            raise ExtractionError(
+                f"Short link did not resolve to a {self.platform.value} URL "
+                f"(HTTP {response.status_code}, {final_url})"
+            )
+        return final_url
+
     async def _download_webpage(self, url: str, **kwargs) -> str:
         """Download a webpage and return the HTML text."""
         return await self.http.get_text(url, **kwargs)
 
+    async def _download_webpage_until(
+        self,
+        url: str,
+        *patterns: re.Pattern[str],
+        max_chars: int = _STREAM_MAX_CHARS,
+        **kwargs,
+    ) -> str:
+        """
+        Stream a webpage and stop reading once every pattern has matched, in order.
+
+        Each pattern is searched for after the previous one's match, and
+        each new chunk is only scanned from a short overlap before it, so
+        the page is scanned roughly once. Patterns must therefore match
+        fewer than _STREAM_SEARCH_OVERLAP characters. Returns the text read
+        so far: the prefix containing the matches, or the first max_chars
+        characters when they never all match.
+        """
+        remaining = list(patterns)
+        text = ""
+        pos = 0  # earliest position the next pattern may match at
+        async with self.http.stream("GET", url, **kwargs) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_text():
+                start = max(pos, len(text) - _STREAM_SEARCH_OVERLAP)
+                text += chunk
+                while remaining and (match := remaining[0].search(text, start)):
+                    pos = start = match.end()
+                    remaining.pop(0)
+                if not remaining or len(text) >= max_chars:
+                    break
+        return text
+
     async def _download_json(self, url: str, **kwargs) -> Any:
         """Download and parse JSON from a URL."""
         return await self.http.get_json(url, **kwargs)
@@ -265,14 +468,17 @@ class BaseExtractor(ABC):
 
     def _search_regex(
         self,
-        pattern: str,
+        pattern: str | re.Pattern[str],
         text: str,
         name: str = "value",
         default: Any = None,
         group: int | str = 1,
         flags: int = 0,
     ) -> Any:
-        """Search for a regex pattern in text. Returns default if not found."""
+        """
+        Search for a regex pattern in text. Returns default if not found.
+        A precompiled pattern may be passed (flags must then be 0).
+        """
         match = re.search(pattern, text, flags)
         if match:
             try:
@@ -10,13 +10,16 @@ Supports:
 
 Uses multiple fallback methods:
 1. GraphQL API (i.instagram.com)
-2. HTML embed page parsing
+2. HTML embed page parsing (posts only; skipped for reels/IGTV)
 3. Mobile API with bearer token
 """
 
+import functools
 import json
 import logging
 import re
+from collections.abc import Awaitable, Callable, Mapping
+from types import MappingProxyType
 
 from ..models.enums import FormatType, Platform
 from ..models.request import ExtractRequest
@@ -31,8 +34,10 @@ from ..utils.helpers import (
     float_or_none,
     format_date,
     int_or_none,
+    json_loads,
     str_or_none,
     traverse_obj,
+    unescape_js_url,
 )
 from .base import BaseExtractor, ExtractionError
 
@@ -48,19 +53,26 @@ _IG_GRAPHQL_URL = "https://www.instagram.com/graphql/query/"
 _IG_GRAPHQL_DOC_ID = "8845758582119845"
 _IG_STORIES_DOC_ID = "25317500907894419"
 
-# Common headers for Instagram API requests
-_IG_HEADERS = {
-    "X-IG-App-ID": _IG_APP_ID,
-    "X-IG-WWW-Claim": "0",
-    "X-Requested-With": "XMLHttpRequest",
-    "Accept": "*/*",
-    "Accept-Language": "en-US,en;q=0.9",
-    "User-Agent": (
-        "Mozilla/5.0 (Linux; Android 13; SM-S908B) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/112.0.0.0 Mobile Safari/537.36"
-    ),
-}
+# Common headers for Instagram API requests (read-only; see _ig_api_headers)
+_IG_HEADERS = MappingProxyType(
+    {
+        "X-IG-App-ID": _IG_APP_ID,
+        "X-IG-WWW-Claim": "0",
+        "X-Requested-With": "XMLHttpRequest",
+        "Accept": "*/*",
+        "Accept-Language": "en-US,en;q=0.9",
+        "User-Agent": (
+            "Mozilla/5.0 (Linux; Android 13; SM-S908B) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/112.0.0.0 Mobile Safari/537.36"
+        ),
+    }
+)
+
+# Embed page: the media URL lives in an inline script near the top of the
+# page, so reading stops once that script has been received
+_EMBED_VIDEO_URL_RE = re.compile(r'"video_url"\s*:\s*"([^"]+)"')
+_SCRIPT_END_RE = re.compile(r"</script>")
 
 # Bearer token for mobile API fallback
 _IG_BEARER_TOKEN = (
@@ -68,20 +80,129 @@ _IG_BEARER_TOKEN = (
 )
 
 
+# Shortcode alphabet (base64url) -> digit value
+_ALPHABET_IDX = {
+    c: i for i, c in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+}
+# bytes.translate() table mapping each ASCII byte to its digit value;
+# bytes outside the alphabet map to 0xFF so they can be rejected
+_INVALID_DIGIT = 0xFF
+_SHORTCODE_TRANS = bytes(_ALPHABET_IDX.get(chr(b), _INVALID_DIGIT) for b in range(256))
+
+
+@functools.lru_cache(maxsize=4096)
 def _shortcode_to_media_id(shortcode: str) -> str:
     """Convert Instagram shortcode to numeric media ID."""
-    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    digits = shortcode.encode("ascii").translate(_SHORTCODE_TRANS)
+    if _INVALID_DIGIT in digits:
+        raise ValueError(f"Invalid Instagram shortcode: {shortcode!r}")
     media_id = 0
-    for char in shortcode:
-        media_id = media_id * 64 + alphabet.index(char)
+    for digit in digits:
+        media_id = (media_id << 6) | digit
     return str(media_id)
 
 
+def _candidates_to_formats(
+    candidates: list[dict] | None,
+    ext: str,
+    format_id: str | None = None,
+) -> list[FormatInfo]:
+    """
+    Build formats from image_versions2/video_versions candidates.
+
+    Instagram lists the same rendition several times; duplicates (by URL)
+    are dropped and the rest ordered largest first.
+    """
+    seen: dict[str, dict] = {}
+    for c in candidates or ():
+        fmt_url = c.get("url")
+        if fmt_url and fmt_url not in seen:
+            seen[fmt_url] = c
+    ordered = sorted(
+        seen.items(),
+        key=lambda kv: (kv[1].get("width") or 0) * (kv[1].get("height") or 0),
+        reverse=True,
+    )
+    return [
+        FormatInfo(
+            url=fmt_url,
+            format_id=format_id,
+            width=c.get("width"),
+            height=c.get("height"),
+            ext=ext,
+            format_type=FormatType.COMBINED,
+        )
+        for fmt_url, c in ordered
+    ]
+
+
+def _image_candidates(item: dict) -> list[dict]:
+    return (item.get("image_versions2") or {}).get("candidates") or []
+
+
+def _photo_formats(item: dict) -> list[FormatInfo]:
+    return _candidates_to_formats(_image_candidates(item), "jpg")
+
+
+def _video_formats(item: dict) -> list[FormatInfo]:
+    return _candidates_to_formats(item.get("video_versions"), "mp4")
+
+
+def _carousel_formats(item: dict) -> list[FormatInfo]:
+    formats: list[FormatInfo] = []
+    extend = formats.extend
+    for idx, cm in enumerate(item.get("carousel_media") or ()):
+        cm_type = cm.get("media_type")
+        if cm_type == 2:  # Video in carousel
+            extend(_candidates_to_formats(cm.get("video_versions"), "mp4", f"carousel_{idx}"))
+        elif cm_type == 1:  # Photo in carousel, best quality only
+            extend(_candidates_to_formats(_image_candidates(cm), "jpg", f"carousel_{idx}_img")[:1])
+    return formats
+
+
+# media_type -> format builder (1 = photo, 2 = video, 8 = carousel)
+_MEDIA_FORMAT_PARSERS: dict[int, Callable[[dict], list[FormatInfo]]] = {
+    1: _photo_formats,
+    2: _video_formats,
+    8: _carousel_formats,
+}
+
+
 class InstagramExtractor(BaseExtractor):
     """Instagram media extractor."""
 
     platform = Platform.INSTAGRAM
 
+    # CDN URLs carry signed expiry tokens; keep cached results well inside that window
+    _response_cache_ttl = 120
+
+    _prewarm_urls = ("https://i.instagram.com/", "https://www.instagram.com/")
+
+    def __init__(self):
+        super().__init__()
+        # (cookie generation, headers) for _ig_api_headers()
+        self._ig_headers_cache: tuple[int, dict[str, str]] | None = None
+
+    def _ig_api_headers(self) -> Mapping[str, str]:
+        """
+        Headers for i.instagram.com API calls, with cookies + CSRF token
+        when available. The cookie overlay is built once per cookie
+        generation and must not be mutated by callers.
+        """
+        if not self._has_cookies():
+            return _IG_HEADERS
+
+        generation = self._cookies.generation
+        if self._ig_headers_cache and self._ig_headers_cache[0] == generation:
+            return self._ig_headers_cache[1]
+
+        headers = {**_IG_HEADERS, "Cookie": self._get_cookie_header()}
+        csrf = self._get_cookie("csrftoken")
+        if csrf:
+            headers["X-CSRFToken"] = csrf
+        self._ig_headers_cache = (generation, headers)
+        return headers
+
     async def _extract(
         self,
         media_id: str,
@@ -97,68 +218,43 @@ class InstagramExtractor(BaseExtractor):
         if is_story:
             return await self._extract_story(media_id, url, request, params)
 
-        # Try multiple extraction methods
-        media_data = None
-        errors = []
-
-        # Method 1: GraphQL API
-        try:
-            media_data = await self._extract_graphql(shortcode)
-        except Exception as e:
-            errors.append(f"GraphQL: {e}")
-            logger.debug(f"Instagram GraphQL failed: {e}")
+        # The embed page only exists for regular posts; reels/IGTV skip it
+        is_reel = "/reel/" in url or "/tv/" in url
 
-        # Method 2: Public JSON from post page
-        if not media_data:
-            try:
-                media_data = await self._extract_public_json(shortcode)
-            except Exception as e:
-                errors.append(f"PublicJSON: {e}")
-                logger.debug(f"Instagram public JSON failed: {e}")
+        async def oembed_web_api() -> ExtractResponse | None:
+            oembed_id = await self._get_oembed_media_id(shortcode)
+            return await self._extract_web_api(oembed_id) if oembed_id else None
 
-        # Method 3: OEmbed -> Web API (media info endpoint)
-        if not media_data:
-            try:
-                oembed_id = await self._get_oembed_media_id(shortcode)
-                if oembed_id:
-                    media_data = await self._extract_web_api(oembed_id)
-            except Exception as e:
-                errors.append(f"OEmbed: {e}")
-                logger.debug(f"Instagram oEmbed failed: {e}")
-
-        # Method 4: Embed page parsing
-        if not media_data:
-            try:
-                media_data = await self._extract_embed(shortcode)
-            except Exception as e:
-                errors.append(f"Embed: {e}")
-                logger.debug(f"Instagram embed failed: {e}")
-
-        # Method 5: Web API (numeric ID fallback)
-        if not media_data:
-            try:
-                numeric_id = _shortcode_to_media_id(shortcode)
-                media_data = await self._extract_web_api(numeric_id)
-            except Exception as e:
-                errors.append(f"WebAPI: {e}")
-                logger.debug(f"Instagram Web API failed: {e}")
+        # Fallback chain, tried in order until one yields media
+        methods: list[tuple[str, Callable[[], Awaitable[ExtractResponse | None]]]] = [
+            ("GraphQL", lambda: self._extract_graphql(shortcode)),
+            ("PublicJSON", lambda: self._extract_public_json(shortcode)),
+            ("OEmbed", oembed_web_api),
+        ]
+        if not is_reel:
+            methods.append(("Embed", lambda: self._extract_embed(shortcode)))
+        methods.append(("WebAPI", lambda: self._extract_web_api(_shortcode_to_media_id(shortcode))))
+        # Mobile API with bearer token (cookies only)
+        if self._has_cookies():
+            methods.append(
+                ("MobileAPI", lambda: self._extract_mobile_api(_shortcode_to_media_id(shortcode)))
+            )
 
-        # Method 6: Mobile API with bearer token (cookies only)
-        if not media_data and self._has_cookies():
+        errors = []
+        for name, method in methods:
             try:
-                numeric_id = _shortcode_to_media_id(shortcode)
-                media_data = await self._extract_mobile_api(numeric_id)
+                media_data = await method()
             except Exception as e:
-                errors.append(f"MobileAPI: {e}")
-                logger.debug(f"Instagram Mobile API failed: {e}")
-
-        if not media_data:
-            raise ExtractionError(
-                f"Could not extract Instagram media. Tried: {'; '.join(errors)}",
-                error_code="instagram.extraction_failed",
-            )
+                errors.append(f"{name}: {e}")
+                logger.debug(f"Instagram {name} failed: {e}")
+                continue
+            if media_data:
+                return media_data
 
-        return media_data
+        raise ExtractionError(
+            f"Could not extract Instagram media. Tried: {'; '.join(errors)}",
+            error_code="instagram.extraction_failed",
+        )
 
     async def _extract_public_json(self, shortcode: str) -> ExtractResponse | None:
         """Extract from public JSON embedded in the post page."""
@@ -430,13 +526,12 @@ class InstagramExtractor(BaseExtractor):
         """Resolve media ID from the oEmbed endpoint."""
         oembed_url = f"{_IG_API_BASE}/oembed/"
         params_dict = {"url": f"https://www.instagram.com/p/{shortcode}/"}
-        headers = dict(_IG_HEADERS)
-        if self._has_cookies():
-            headers["Cookie"] = self._get_cookie_header()
-        response = await self.http.get(oembed_url, headers=headers, params=params_dict)
+        response = await self.http.get(
+            oembed_url, headers=self._ig_api_headers(), params=params_dict
+        )
         if response.status_code != 200:
             raise ExtractionError(f"oEmbed API returned {response.status_code}")
-        data = response.json()
+        data = json_loads(response.content)
         return data.get("media_id")
 
     async def _extract_graphql(self, shortcode: str) -> ExtractResponse | None:
@@ -486,7 +581,7 @@ class InstagramExtractor(BaseExtractor):
         if response.status_code != 200:
             raise ExtractionError(f"GraphQL API returned {response.status_code}")
 
-        data = response.json()
+        data = json_loads(response.content)
         media = traverse_obj(
             data,
             ("data", "xdt_shortcode_media"),
@@ -501,18 +596,11 @@ class InstagramExtractor(BaseExtractor):
         """Extract using Instagram web API."""
         url = f"{_IG_API_BASE}/media/{numeric_id}/info/"
 
-        headers = dict(_IG_HEADERS)
-        if self._has_cookies():
-            headers["Cookie"] = self._get_cookie_header()
-            csrf = self._get_cookie("csrftoken")
-            if csrf:
-                headers["X-CSRFToken"] = csrf
-
-        response = await self.http.get(url, headers=headers)
+        response = await self.http.get(url, headers=self._ig_api_headers())
         if response.status_code != 200:
             raise ExtractionError(f"Web API returned {response.status_code}")
 
-        data = response.json()
+        data = json_loads(response.content)
         items = data.get("items", [])
         if not items:
             raise ExtractionError("No items in Web API response")
@@ -530,7 +618,9 @@ class InstagramExtractor(BaseExtractor):
             ),
         }
 
-        html = await self._download_webpage(embed_url, headers=headers)
+        html = await self._download_webpage_until(
+            embed_url, _EMBED_VIDEO_URL_RE, _SCRIPT_END_RE, headers=headers
+        )
 
         # Try JSON data embedded in the page first
         additional = self._extract_additional_data(html)
@@ -543,12 +633,8 @@ class InstagramExtractor(BaseExtractor):
                 return self._parse_media_item(items[0], shortcode)
 
         # Try to find video URL in embed page
-        video_url = self._search_regex(
-            r'"video_url"\s*:\s*"([^"]+)"',
-            html,
-            "video_url",
-            default=None,
-        )
+        match = _EMBED_VIDEO_URL_RE.search(html)
+        video_url = match.group(1) if match else None
 
         if not video_url:
             # Try alternate patterns
@@ -562,7 +648,7 @@ class InstagramExtractor(BaseExtractor):
         if not video_url:
             raise ExtractionError("Could not find video in embed page")
 
-        video_url = video_url.replace("\\u0026", "&").replace("\\/", "/")
+        video_url = unescape_js_url(video_url)
 
         # Extract metadata from embed
         title = self._search_regex(
@@ -576,7 +662,7 @@ class InstagramExtractor(BaseExtractor):
             default=None,
         )
         if thumbnail:
-            thumbnail = thumbnail.replace("\\u0026", "&").replace("\\/", "/")
+            thumbnail = unescape_js_url(thumbnail)
 
         formats = [
             FormatInfo(
@@ -614,7 +700,7 @@ class InstagramExtractor(BaseExtractor):
         if response.status_code != 200:
             raise ExtractionError(f"Mobile API returned {response.status_code}")
 
-        data = response.json()
+        data = json_loads(response.content)
         items = data.get("items", [])
         if not items:
             raise ExtractionError("No items in Mobile API response")
@@ -658,7 +744,7 @@ class InstagramExtractor(BaseExtractor):
         if response.status_code != 200:
             raise ExtractionError(f"Stories GraphQL returned {response.status_code}")
 
-        data = response.json()
+        data = json_loads(response.content)
         reels = traverse_obj(data, ("data", "reels_media"), default=None) or traverse_obj(
             data, ("data", "reels"), default=None
         )
@@ -743,26 +829,20 @@ class InstagramExtractor(BaseExtractor):
         except Exception as e:
             logger.debug(f"Instagram story GraphQL failed: {e}")
 
-        headers = dict(_IG_HEADERS)
-        headers["Cookie"] = self._get_cookie_header()
-        csrf = self._get_cookie("csrftoken")
-        if csrf:
-            headers["X-CSRFToken"] = csrf
-
         # Get story reel
         reel_url = f"{_IG_API_BASE}/feed/reels_media/"
         params_dict = {"reel_ids": story_pk}
 
         response = await self.http.get(
             reel_url,
-            headers=headers,
+            headers=self._ig_api_headers(),
             params=params_dict,
         )
 
         if response.status_code != 200:
             raise ExtractionError(f"Stories API returned {response.status_code}")
 
-        data = response.json()
+        data = json_loads(response.content)
         reels = data.get("reels_media", []) or data.get("reels", {})
 
         if not reels:
@@ -773,16 +853,15 @@ class InstagramExtractor(BaseExtractor):
     def _parse_media_item(self, item: dict, media_id: str) -> ExtractResponse:
         """Parse a media item from any Instagram API response."""
         media_type = item.get("media_type")
-        # 1 = photo, 2 = video, 8 = carousel
 
-        formats = []
-        title = None
-        duration = None
-        thumbnail = None
+        # Unpack the nested objects once instead of walking each path separately
+        user_d = item.get("user") or {}
+        user = user_d.get("username")
+        caption = (item.get("caption") or {}).get("text")
+        candidates = _image_candidates(item)
+        thumbnail = (candidates[0] or {}).get("url") if candidates else None
 
         # Get caption/title
-        caption = traverse_obj(item, ("caption", "text"))
-        user = traverse_obj(item, ("user", "username"))
         title = (
             f"@{user}: {caption[:100]}"
             if caption and user
@@ -791,81 +870,14 @@ class InstagramExtractor(BaseExtractor):
             else "Instagram Post"
         )
 
-        # Get thumbnail
-        thumbnail = traverse_obj(item, ("image_versions2", "candidates", 0, "url"))
-
-        if media_type == 8:
-            # Carousel - extract all items
-            carousel_media = item.get("carousel_media", [])
-            for idx, cm in enumerate(carousel_media):
-                cm_type = cm.get("media_type")
-                if cm_type == 2:  # Video in carousel
-                    video_versions = cm.get("video_versions", [])
-                    for v in video_versions:
-                        fmt_url = v.get("url")
-                        if fmt_url:
-                            formats.append(
-                                FormatInfo(
-                                    url=fmt_url,
-                                    format_id=f"carousel_{idx}",
-                                    width=v.get("width"),
-                                    height=v.get("height"),
-                                    ext="mp4",
-                                    format_type=FormatType.COMBINED,
-                                )
-                            )
-                elif cm_type == 1:  # Photo in carousel
-                    candidates = traverse_obj(cm, ("image_versions2", "candidates")) or []
-                    for c in candidates[:1]:  # Just the best quality
-                        fmt_url = c.get("url")
-                        if fmt_url:
-                            formats.append(
-                                FormatInfo(
-                                    url=fmt_url,
-                                    format_id=f"carousel_{idx}_img",
-                                    width=c.get("width"),
-                                    height=c.get("height"),
-                                    ext="jpg",
-                                    format_type=FormatType.COMBINED,
-                                )
-                            )
-        elif media_type == 2:
-            # Single video
-            duration = float_or_none(item.get("video_duration"))
-            video_versions = item.get("video_versions", [])
-
-            for v in video_versions:
-                fmt_url = v.get("url")
-                if fmt_url:
-                    formats.append(
-                        FormatInfo(
-                            url=fmt_url,
-                            width=v.get("width"),
-                            height=v.get("height"),
-                            ext="mp4",
-                            format_type=FormatType.COMBINED,
-                        )
-                    )
-        elif media_type == 1:
-            # Single photo
-            candidates = traverse_obj(item, ("image_versions2", "candidates")) or []
-            for c in candidates:
-                fmt_url = c.get("url")
-                if fmt_url:
-                    formats.append(
-                        FormatInfo(
-                            url=fmt_url,
-                            width=c.get("width"),
-                            height=c.get("height"),
-                            ext="jpg",
-                            format_type=FormatType.COMBINED,
-                        )
-                    )
+        parse_formats = _MEDIA_FORMAT_PARSERS.get(media_type)
+        formats = parse_formats(item) if parse_formats else []
+        duration = float_or_none(item.get("video_duration")) if media_type == 2 else None
 
         # Build metadata
         metadata = MediaMetadata(
             uploader=user,
-            uploader_id=str_or_none(traverse_obj(item, ("user", "pk"))),
+            uploader_id=str_or_none(user_d.get("pk")),
             description=caption,
             like_count=int_or_none(item.get("like_count")),
             comment_count=int_or_none(item.get("comment_count")),
@@ -24,7 +24,9 @@ from ..utils.helpers import (
     clean_html,
     float_or_none,
     int_or_none,
+    json_loads,
     traverse_obj,
+    unescape_js_url,
 )
 from .base import BaseExtractor, ExtractionError
 
@@ -33,6 +35,32 @@ logger = logging.getLogger(__name__)
 _PINTEREST_API = "https://www.pinterest.com/resource/PinResource/get/"
 _PINTEREST_SHORTLINK_API = "https://api.pinterest.com/url_shortener"
 
+# Pre-serialized PinResource "data" param; only numeric pin IDs are spliced in
+_PIN_OPTIONS_TMPL = '{{"options":{{"id":"{pid}","field_set_key":"unauth_react_main_pin"}}}}'
+_NUMERIC_PIN_ID_RE = re.compile(r"[0-9]+")
+
+# HTML fallback markers (matches both compact and spaced JSON in one scan)
+_PIN_NOT_FOUND_RE = re.compile(r'"__typename":\s?"PinNotFound"')
+_PIN_VIDEO_RE = re.compile(r'"url"\s*:\s*"(https://v1\.pinimg\.com/videos/[^"]+\.mp4[^"]*)"')
+_PIN_IMAGE_RE = re.compile(r'src="(https://i\.pinimg\.com/[^"]+\.(jpg|gif))"')
+
+# video_list renditions in descending preference
+_PIN_QUALITY_ORDER = (
+    "V_720P",
+    "V_HLSV4",
+    "V_HLSV3_WEB",
+    "V_HLSV3_MOBILE",
+    "V_EXP7",
+    "V_EXP6",
+    "V_EXP5",
+    "V_EXP4",
+    "V_EXP3",
+    "V_EXP2",
+)
+
+# images renditions, largest first
+_PIN_IMG_ORDER = ("orig", "1200x", "736x", "474x", "236x")
+
 _PINTEREST_HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -51,6 +79,9 @@ class PinterestExtractor(BaseExtractor):
 
     platform = Platform.PINTEREST
 
+    _response_cache_ttl = 300
+    _prewarm_urls = ("https://www.pinterest.com/",)
+
     async def _extract(
         self,
         media_id: str,
@@ -74,7 +105,7 @@ class PinterestExtractor(BaseExtractor):
 
         # Method 1: Pinterest Resource API
         try:
-            return await self._extract_api(pin_id)
+            return await self._extract_api(pin_id, all_images=request.all_qualities)
         except ExtractionError:
             raise
         except Exception as e:
@@ -91,18 +122,20 @@ class PinterestExtractor(BaseExtractor):
             error_code="pinterest.extraction_failed",
         )
 
-    async def _extract_api(self, pin_id: str) -> ExtractResponse:
+    async def _extract_api(self, pin_id: str, all_images: bool = False) -> ExtractResponse:
         """Extract using Pinterest Resource API."""
-        data = {
-            "options": {
-                "id": pin_id,
-                "field_set_key": "unauth_react_main_pin",
-            },
-        }
+        if _NUMERIC_PIN_ID_RE.fullmatch(pin_id):
+            data = _PIN_OPTIONS_TMPL.format(pid=pin_id)
+        else:
+            # Unresolved short codes etc. need proper JSON escaping
+            data = json.dumps(
+                {"options": {"id": pin_id, "field_set_key": "unauth_react_main_pin"}},
+                separators=(",", ":"),
+            )
 
         params = {
             "source_url": f"/pin/{pin_id}/",
-            "data": json.dumps(data),
+            "data": data,
         }
 
         headers = dict(_PINTEREST_HEADERS)
@@ -118,13 +151,13 @@ class PinterestExtractor(BaseExtractor):
         if response.status_code != 200:
             raise ExtractionError(f"Pinterest API returned {response.status_code}")
 
-        result = response.json()
+        result = json_loads(response.content)
         pin_data = traverse_obj(result, ("resource_response", "data"))
 
         if not pin_data:
             raise ExtractionError("No pin data in API response")
 
-        return self._parse_pin(pin_data, pin_id)
+        return self._parse_pin(pin_data, pin_id, all_images=all_images)
 
     async def _extract_html(self, pin_id: str, url: str) -> ExtractResponse:
         """Extract from Pinterest HTML page."""
@@ -134,18 +167,15 @@ class PinterestExtractor(BaseExtractor):
         html = await self._download_webpage(page_url, headers=headers)
 
         # Check for PinNotFound
-        if '"__typename":"PinNotFound"' in html or '"__typename": "PinNotFound"' in html:
+        if _PIN_NOT_FOUND_RE.search(html):
             raise ExtractionError("Pin not found", error_code="pinterest.not_found")
 
         formats = []
 
         # Extract video URL from HTML (cobalt pattern)
-        video_match = re.search(
-            r'"url"\s*:\s*"(https://v1\.pinimg\.com/videos/[^"]+\.mp4[^"]*)"',
-            html,
-        )
+        video_match = _PIN_VIDEO_RE.search(html)
         if video_match:
-            video_url = video_match.group(1).replace("\\u002F", "/").replace("\\/", "/")
+            video_url = unescape_js_url(video_match.group(1))
             formats.append(
                 FormatInfo(
                     url=video_url,
@@ -157,10 +187,7 @@ class PinterestExtractor(BaseExtractor):
 
         # Extract image URL
         if not formats:
-            img_match = re.search(
-                r'src="(https://i\.pinimg\.com/[^"]+\.(jpg|gif))"',
-                html,
-            )
+            img_match = _PIN_IMAGE_RE.search(html)
             if img_match:
                 formats.append(
                     FormatInfo(
@@ -186,9 +213,15 @@ class PinterestExtractor(BaseExtractor):
             formats=formats,
         )
 
-    def _parse_pin(self, data: dict, pin_id: str) -> ExtractResponse:
-        """Parse Pinterest pin data."""
+    def _parse_pin(self, data: dict, pin_id: str, all_images: bool = False) -> ExtractResponse:
+        """
+        Parse Pinterest pin data.
+
+        Image pins yield only the largest rendition unless all_images is set.
+        """
         formats = []
+        append = formats.append
+        combined = FormatType.COMBINED
         title = data.get("title") or data.get("grid_title") or ""
         description = data.get("description") or data.get("description_html") or ""
         thumbnail = None
@@ -197,24 +230,32 @@ class PinterestExtractor(BaseExtractor):
         videos = data.get("videos") or {}
         video_list = videos.get("video_list", {})
 
+        duration = None
         if video_list:
-            for quality_key, video_info in video_list.items():
+            # Every rendition reports the same duration (ms); read it once
+            first_info = next(iter(video_list.values()), None) or {}
+            duration = float_or_none(first_info.get("duration"), scale=1000)
+
+            # Known renditions first, best to worst; anything unrecognised after
+            ordered_keys = [k for k in _PIN_QUALITY_ORDER if k in video_list]
+            ordered_keys.extend(k for k in video_list if k not in _PIN_QUALITY_ORDER)
+            for quality_key in ordered_keys:
+                video_info = video_list[quality_key] or {}
                 video_url = video_info.get("url")
                 if not video_url:
                     continue
 
                 width = int_or_none(video_info.get("width"))
                 height = int_or_none(video_info.get("height"))
-                float_or_none(video_info.get("duration"), scale=1000)
 
-                formats.append(
+                append(
                     FormatInfo(
                         url=video_url,
                         format_id=quality_key,
                         ext="mp4",
                         width=width,
                         height=height,
-                        format_type=FormatType.COMBINED,
+                        format_type=combined,
                         quality_label=quality_key,
                     )
                 )
@@ -222,55 +263,55 @@ class PinterestExtractor(BaseExtractor):
         # Check for story pin data (multi-page pins)
         story_pin = data.get("story_pin_data")
         if story_pin and not formats:
-            pages = story_pin.get("pages", [])
-            for idx, page in enumerate(pages):
-                blocks = page.get("blocks", [])
-                for block in blocks:
-                    video = block.get("video", {})
-                    vl = video.get("video_list", {})
+            for idx, page in enumerate(story_pin.get("pages") or ()):
+                prefix = f"story_{idx}_"
+                for block in page.get("blocks") or ():
+                    vl = (block.get("video") or {}).get("video_list") or {}
                     for qk, vi in vl.items():
                         v_url = vi.get("url")
                         if v_url:
-                            formats.append(
+                            append(
                                 FormatInfo(
                                     url=v_url,
-                                    format_id=f"story_{idx}_{qk}",
+                                    format_id=prefix + qk,
                                     ext="mp4",
                                     width=int_or_none(vi.get("width")),
                                     height=int_or_none(vi.get("height")),
-                                    format_type=FormatType.COMBINED,
+                                    format_type=combined,
                                 )
                             )
 
         # Get images if no video
         if not formats:
-            images = data.get("images", {})
+            images = data.get("images") or {}
             if images:
-                # Get highest quality image
-                for size_key in ["orig", "1200x", "736x", "474x", "236x"]:
-                    if size_key in images:
-                        img_url = images[size_key].get("url")
-                        if img_url:
-                            formats.append(
-                                FormatInfo(
-                                    url=img_url,
-                                    format_id=size_key,
-                                    ext="jpg",
-                                    width=int_or_none(images[size_key].get("width")),
-                                    height=int_or_none(images[size_key].get("height")),
-                                    format_type=FormatType.COMBINED,
-                                )
+                # Largest first; stop after the first usable one unless asked for all
+                for size_key in _PIN_IMG_ORDER:
+                    image = images.get(size_key)
+                    img_url = image.get("url") if image else None
+                    if img_url:
+                        append(
+                            FormatInfo(
+                                url=img_url,
+                                format_id=size_key,
+                                ext="jpg",
+                                width=int_or_none(image.get("width")),
+                                height=int_or_none(image.get("height")),
+                                format_type=combined,
                             )
+                        )
+                        if not all_images:
+                            break
 
             # Also check image_large_url
             large_url = data.get("image_large_url")
             if large_url and not formats:
-                formats.append(
+                append(
                     FormatInfo(
                         url=large_url,
                         format_id="large",
                         ext="jpg",
-                        format_type=FormatType.COMBINED,
+                        format_type=combined,
                     )
                 )
 
@@ -305,6 +346,7 @@ class PinterestExtractor(BaseExtractor):
             platform=Platform.PINTEREST,
             id=pin_id,
             title=title,
+            duration=duration,
             thumbnail=thumbnail,
             formats=formats,
             metadata=metadata,
@@ -13,7 +13,10 @@ Supports:
 import base64
 import logging
 import re
+import time
+from types import MappingProxyType
 
+from ..core.cache import TTLCache
 from ..models.enums import FormatType, Platform
 from ..models.request import ExtractRequest
 from ..models.response import (
@@ -25,7 +28,7 @@ from ..utils.helpers import (
     float_or_none,
     format_date,
     int_or_none,
-    traverse_obj,
+    json_loads,
 )
 from .base import BaseExtractor, ExtractionError
 
@@ -41,16 +44,60 @@ _REDDIT_HEADERS = {
     "Accept-Language": "en-US,en;q=0.9",
 }
 
+# Headers for the unauthenticated JSON endpoints (read-only, shared by every request)
+_REDDIT_JSON_HEADERS = MappingProxyType({**_REDDIT_HEADERS, "Accept": "application/json"})
+
 # Reddit OAuth2 credentials (anonymous access)
 _REDDIT_CLIENT_ID = "1t0Fk8PCQO9INg"
 _REDDIT_CLIENT_SECRET = ""
 
+# Refresh the anonymous token this many seconds before Reddit expires it
+_TOKEN_EXPIRY_MARGIN = 60
+
+# Post JSON endpoints, in default order of preference. raw_json=1 stops Reddit
+# HTML-escaping "&" as "&amp;" in URL fields, so they can be used as-is;
+# limit=1 trims the comment tree (the second listing), which we never read.
+_JSON_ENDPOINTS = {
+    "old": "https://old.reddit.com/comments/{post_id}.json?raw_json=1&limit=1",
+    "www": "https://www.reddit.com/comments/{post_id}/.json?raw_json=1&limit=1",
+    "oauth": "https://oauth.reddit.com/comments/{post_id}.json?raw_json=1&limit=1",
+}
+
+# DASH renditions v.redd.it may offer besides the fallback_url one
+_DASH_HEIGHTS = (1080, 720, 480, 360, 240)
+
+_COMMENTS_ID_RE = re.compile(r"/comments/([a-zA-Z0-9]+)")
+_DASH_SUFFIX_RE = re.compile(r"/DASH_\d+(?:\.mp4)?$")
+
+# Statuses meaning "not without auth" (worth an OAuth attempt), as opposed to
+# 404s, 5xx (already retried by HTTPClient) and network errors, which OAuth won't fix
+_AUTH_GATED_STATUSES = frozenset({401, 403, 429, 451})
+
+# Skip an endpoint for _ENDPOINT_COOLDOWN seconds after this many failures in a row
+_ENDPOINT_FAIL_THRESHOLD = 3
+_ENDPOINT_COOLDOWN = 300
+
 
 class RedditExtractor(BaseExtractor):
     """Reddit media extractor."""
 
     platform = Platform.REDDIT
-    _oauth_token: str | None = None
+
+    # Short link (without query) -> resolved post URL, shared across requests
+    _redirect_cache = TTLCache(maxsize=2048, ttl=3600)
+
+    # Anonymous OAuth token -> (token, expires_in); valid ~1h, shared across requests
+    _token_cache = TTLCache(maxsize=1, ttl=3600)
+
+    # Per-endpoint health: {"ok": successes, "fail": consecutive failures, "last_fail": t}
+    _endpoint_stats: dict[str, dict[str, float]] = {}
+
+    def __init__(self):
+        super().__init__()
+        # Bearer for this request (a user's token_v2 cookie or the shared anonymous token)
+        self._oauth_token: str | None = None
+        # HTTP status of each endpoint tried during this extraction
+        self._endpoint_status: dict[str, int] = {}
 
     async def _extract(
         self,
@@ -65,10 +112,13 @@ class RedditExtractor(BaseExtractor):
         # Resolve short links
         if "v.redd.it" in url or "redd.it" in url:
             try:
-                resolved = await self.http.resolve_redirect(url)
-                url = resolved
+                short_url = url.split("?", 1)[0]
+                # Only a URL with /comments/<id> is cached; failures raise
+                url = await self._redirect_cache.get_or_load(
+                    short_url, lambda: self._resolve_short_link(url, _COMMENTS_ID_RE)
+                )
                 # Re-extract post ID
-                id_match = re.search(r"/comments/([a-zA-Z0-9]+)", url)
+                id_match = _COMMENTS_ID_RE.search(url)
                 if id_match:
                     post_id = id_match.group(1)
             except Exception as e:
@@ -83,7 +133,9 @@ class RedditExtractor(BaseExtractor):
                 error_code="reddit.fetch_failed",
             )
 
-        return self._parse_post(post_data, post_id)
+        return self._parse_post(
+            post_data, post_id, max_height=self._quality_to_height(request.quality)
+        )
 
     async def _get_oauth_token(self) -> str:
         """Get OAuth2 token for Reddit API access."""
@@ -97,7 +149,17 @@ class RedditExtractor(BaseExtractor):
                 self._oauth_token = bearer
                 return bearer
 
-        # Otherwise, get anonymous token
+        # Otherwise, use the shared anonymous token (fetched once per expiry)
+        token, _ = await self._token_cache.get_or_load(
+            "anonymous",
+            self._fetch_anonymous_token,
+            ttl=lambda entry: entry[1] - _TOKEN_EXPIRY_MARGIN if entry[0] else 0,
+        )
+        self._oauth_token = token or None
+        return token
+
+    async def _fetch_anonymous_token(self) -> tuple[str, float]:
+        """Request an application-only OAuth token; returns (token, expires_in)."""
         auth = base64.b64encode(f"{_REDDIT_CLIENT_ID}:{_REDDIT_CLIENT_SECRET}".encode()).decode()
 
         response = await self.http.post(
@@ -111,89 +173,140 @@ class RedditExtractor(BaseExtractor):
         )
 
         if response.status_code == 200:
-            data = response.json()
-            self._oauth_token = data.get("access_token")
-            return self._oauth_token or ""
+            data = json_loads(response.content)
+            return data.get("access_token") or "", float_or_none(data.get("expires_in")) or 3600
 
-        return ""
+        return "", 0
 
     async def _fetch_post_data(self, post_id: str, url: str) -> dict | None:
-        """Fetch Reddit post data using the JSON API."""
-        # Build clean JSON API URL using old.reddit.com which is more reliable
-        json_url = f"https://old.reddit.com/comments/{post_id}.json"
-
-        headers = dict(_REDDIT_HEADERS)
-        headers["Accept"] = "application/json"
+        """
+        Fetch Reddit post data using the JSON API.
+
+        The unauthenticated endpoints are idempotent GETs, so they are
+        raced and the first good answer wins. OAuth costs an extra token
+        round trip, so it is only tried when every endpoint that answered
+        refused access (see _AUTH_GATED_STATUSES). An endpoint that keeps
+        failing is skipped for a cooldown period.
+        """
+        order = self._endpoint_order()
+        unauth = [name for name in order if name != "oauth"]
+        if unauth:
+            for name in unauth:
+                self._endpoint_status.pop(name, None)
+            data = await self._race_endpoints(unauth, post_id)
+            if data is not None:
+                return data
+            # Endpoints that failed before answering (network errors) have no status
+            statuses = [self._endpoint_status[n] for n in unauth if n in self._endpoint_status]
+            if not statuses or not all(s in _AUTH_GATED_STATUSES for s in statuses):
+                logger.debug("Reddit JSON endpoints failed without an auth error; skipping OAuth")
+                return None
+
+        if "oauth" in order:
+            return await self._race_endpoints(["oauth"], post_id)
+        return None
 
-        try:
-            response = await self.http.get(json_url, headers=headers)
-            logger.debug(f"Reddit JSON API status: {response.status_code}")
-            if response.status_code == 200:
-                data = response.json()
-                if isinstance(data, list) and len(data) > 0:
-                    return data[0]
-        except Exception as e:
-            logger.debug(f"Reddit JSON API failed: {e}")
+    async def _race_endpoints(self, names: list[str], post_id: str) -> dict | None:
+        """Fetch from all named endpoints at once; return the first success."""
+        return await self._first_result(
+            {f"{name} JSON API": self._fetch_endpoint(name, post_id) for name in names}
+        )
 
-        # Try with www.reddit.com and raw_json param
-        json_url2 = f"https://www.reddit.com/comments/{post_id}/.json?raw_json=1"
-        try:
-            response = await self.http.get(json_url2, headers=headers)
-            if response.status_code == 200:
-                data = response.json()
-                if isinstance(data, list) and len(data) > 0:
-                    return data[0]
-        except Exception as e:
-            logger.debug(f"Reddit www JSON API failed: {e}")
+    async def _fetch_endpoint(self, name: str, post_id: str) -> dict | None:
+        """
+        GET one post JSON endpoint; returns the post listing or None.
 
-        # Try OAuth API
+        Only transport errors, 5xx and auth-gated statuses count against the
+        endpoint's health: a 404 or empty listing is about the post, and the
+        host still answered.
+        """
+        data = None
+        host_ok = False
         try:
-            token = await self._get_oauth_token()
-            if token:
-                oauth_headers = {
+            if name == "oauth":
+                token = await self._get_oauth_token()
+                if not token:
+                    raise ExtractionError("no OAuth token")
+                headers = {
                     "Authorization": f"Bearer {token}",
                     "User-Agent": "MediaFetchAPI/1.0",
                 }
-                api_url = f"https://oauth.reddit.com/comments/{post_id}.json"
-                response = await self.http.get(api_url, headers=oauth_headers)
-                if response.status_code == 200:
-                    data = response.json()
-                    if isinstance(data, list) and len(data) > 0:
-                        return data[0]
-        except Exception as e:
-            logger.debug(f"Reddit OAuth API failed: {e}")
+            else:
+                headers = _REDDIT_JSON_HEADERS
 
-        return None
+            response = await self.http.get(
+                _JSON_ENDPOINTS[name].format(post_id=post_id), headers=headers
+            )
+            logger.debug(f"Reddit {name} JSON API status: {response.status_code}")
+            self._endpoint_status[name] = response.status_code
+            if response.status_code == 200:
+                listing = json_loads(response.content)
+                if isinstance(listing, list) and len(listing) > 0:
+                    data = listing[0]
+            status = response.status_code
+            host_ok = status < 500 and status not in _AUTH_GATED_STATUSES
+        except Exception as e:
+            logger.debug(f"Reddit {name} JSON API failed: {e}")
+        self._record_endpoint(name, host_ok)
+        return data
+
+    def _endpoint_order(self) -> list[str]:
+        """Healthy endpoints, fewest recent failures first (stable on ties)."""
+        stats = self._endpoint_stats
+        now = time.monotonic()
+        healthy = [
+            name
+            for name in _JSON_ENDPOINTS
+            if not (
+                (s := stats.get(name))
+                and s["fail"] >= _ENDPOINT_FAIL_THRESHOLD
+                and now - s["last_fail"] < _ENDPOINT_COOLDOWN
+            )
+        ]
+        # If everything is tripped, try them all rather than fail outright
+        order = healthy or list(_JSON_ENDPOINTS)
+        return sorted(order, key=lambda name: stats.get(name, {}).get("fail", 0))
+
+    def _record_endpoint(self, name: str, ok: bool):
+        stats = self._endpoint_stats.setdefault(name, {"ok": 0, "fail": 0, "last_fail": 0.0})
+        if ok:
+            stats["ok"] += 1
+            stats["fail"] = 0
+        else:
+            stats["fail"] += 1
+            stats["last_fail"] = time.monotonic()
+
+    def _parse_post(
+        self, data: dict, post_id: str, max_height: int | None = None
+    ) -> ExtractResponse:
+        """
+        Parse Reddit post data.
 
-    def _parse_post(self, data: dict, post_id: str) -> ExtractResponse:
-        """Parse Reddit post data."""
-        children = traverse_obj(data, ("data", "children", 0, "data")) or {}
+        Guessed DASH variants are limited to heights below the source and,
+        when a specific quality was requested, at or below max_height.
+        """
+        listing = (data.get("data") or {}).get("children") or ()
+        children = (listing[0].get("data") if listing else None) or {}
 
         if not children:
             raise ExtractionError("No post data found in Reddit response")
 
         title = children.get("title", "Reddit Post")
-        children.get("subreddit", "")
         author = children.get("author", "")
-        url = children.get("url", "")
+        url = children.get("url") or ""
 
         formats = []
-        thumbnail = None
         duration = None
 
-        # Check for Reddit-hosted video
-        children.get("is_video", False)
-        media = children.get("media") or {}
-        reddit_video = media.get("reddit_video") or {}
-
-        # Also check secure_media
-        if not reddit_video:
-            secure_media = children.get("secure_media") or {}
-            reddit_video = secure_media.get("reddit_video") or {}
+        # Check for Reddit-hosted video (media, then secure_media)
+        reddit_video = (children.get("media") or {}).get("reddit_video") or (
+            children.get("secure_media") or {}
+        ).get("reddit_video")
 
         # Check crosspost
         if not reddit_video:
-            crosspost = traverse_obj(children, ("crosspost_parent_list", 0))
+            crossposts = children.get("crosspost_parent_list")
+            crosspost = crossposts[0] if crossposts else None
             if crosspost:
                 cp_media = crosspost.get("media") or crosspost.get("secure_media") or {}
                 reddit_video = cp_media.get("reddit_video") or {}
@@ -202,7 +315,6 @@ class RedditExtractor(BaseExtractor):
             # Reddit-hosted video
             fallback_url = reddit_video.get("fallback_url")
             hls_url = reddit_video.get("hls_url")
-            reddit_video.get("dash_url")
             duration = float_or_none(reddit_video.get("duration"))
             height = int_or_none(reddit_video.get("height"))
             width = int_or_none(reddit_video.get("width"))
@@ -211,8 +323,7 @@ class RedditExtractor(BaseExtractor):
                 # The fallback URL is video-only. Audio is at a separate URL.
                 # Video URL format: https://v.redd.it/{id}/DASH_{quality}.mp4
                 video_url = fallback_url.split("?")[0]
-                base_url = re.sub(r"/DASH_\d+\.mp4$", "", video_url)
-                base_url = re.sub(r"/DASH_\d+$", "", base_url)
+                base_url = _DASH_SUFFIX_RE.sub("", video_url)
 
                 # Add main video format
                 formats.append(
@@ -229,45 +340,36 @@ class RedditExtractor(BaseExtractor):
                     )
                 )
 
-                # Try to find additional quality variants
-                for quality in [1080, 720, 480, 360, 240]:
-                    if quality == height:
-                        continue
-                    variant_url = f"{base_url}/DASH_{quality}.mp4"
-                    formats.append(
-                        FormatInfo(
-                            url=variant_url,
-                            format_id=f"video_{quality}p",
-                            ext="mp4",
-                            height=quality,
-                            vcodec="avc1",
-                            acodec="none",
-                            format_type=FormatType.VIDEO_ONLY,
-                            quality_label=f"{quality}p",
-                        )
+                # Try to find additional quality variants (Reddit never upscales)
+                formats.extend(
+                    FormatInfo(
+                        url=f"{base_url}/DASH_{quality}.mp4",
+                        format_id=f"video_{quality}p",
+                        ext="mp4",
+                        height=quality,
+                        vcodec="avc1",
+                        acodec="none",
+                        format_type=FormatType.VIDEO_ONLY,
+                        quality_label=f"{quality}p",
                     )
+                    for quality in _DASH_HEIGHTS
+                    if not (height and quality >= height)
+                    and not (max_height and quality > max_height)
+                )
 
-                # Find audio stream
-                # Reddit audio is at DASH_AUDIO_128.mp4 or DASH_audio.mp4
-                audio_variants = [
-                    f"{base_url}/DASH_AUDIO_128.mp4",
-                    f"{base_url}/DASH_audio.mp4",
-                    f"{base_url}/DASH_AUDIO_64.mp4",
-                    f"{base_url}/audio",
-                ]
-
-                for audio_url in audio_variants:
-                    formats.append(
-                        FormatInfo(
-                            url=audio_url,
-                            format_id="audio",
-                            ext="mp4",
-                            acodec="mp4a",
-                            vcodec="none",
-                            format_type=FormatType.AUDIO_ONLY,
-                        )
+                # Audio stream. Newer posts use DASH_AUDIO_128.mp4 (older ones
+                # DASH_audio.mp4 / DASH_AUDIO_64.mp4); only the first is offered
+                # and the client verifies it.
+                formats.append(
+                    FormatInfo(
+                        url=f"{base_url}/DASH_AUDIO_128.mp4",
+                        format_id="audio",
+                        ext="mp4",
+                        acodec="mp4a",
+                        vcodec="none",
+                        format_type=FormatType.AUDIO_ONLY,
                     )
-                    break  # Just add the first variant; client will verify
+                )
 
             # Add HLS if available
             if hls_url:
@@ -295,32 +397,31 @@ class RedditExtractor(BaseExtractor):
 
         # Check for Reddit gallery
         elif children.get("is_gallery"):
-            gallery_data = children.get("gallery_data", {})
-            media_metadata = children.get("media_metadata", {})
-            for item in gallery_data.get("items", []):
-                mid = item.get("media_id")
-                if mid and mid in media_metadata:
-                    mm = media_metadata[mid]
-                    if mm.get("e") == "AnimatedImage":
-                        gif_url = traverse_obj(mm, ("s", "gif"))
-                        mp4_url = traverse_obj(mm, ("s", "mp4"))
-                        if mp4_url:
-                            formats.append(
-                                FormatInfo(url=mp4_url, ext="mp4", format_type=FormatType.COMBINED)
-                            )
-                        elif gif_url:
-                            formats.append(
-                                FormatInfo(url=gif_url, ext="gif", format_type=FormatType.COMBINED)
-                            )
+            gallery_data = children.get("gallery_data") or {}
+            media_metadata = children.get("media_metadata") or {}
+            for item in gallery_data.get("items") or ():
+                mm = media_metadata.get(item.get("media_id"))
+                if mm and mm.get("e") == "AnimatedImage":
+                    source = mm.get("s") or {}
+                    gif_url = source.get("gif")
+                    mp4_url = source.get("mp4")
+                    if mp4_url:
+                        formats.append(
+                            FormatInfo(url=mp4_url, ext="mp4", format_type=FormatType.COMBINED)
+                        )
+                    elif gif_url:
+                        formats.append(
+                            FormatInfo(url=gif_url, ext="gif", format_type=FormatType.COMBINED)
+                        )
 
         # Thumbnail
         thumbnail = children.get("thumbnail")
         if thumbnail in ("default", "self", "nsfw", "spoiler", ""):
             thumbnail = None
         if not thumbnail:
-            preview = traverse_obj(children, ("preview", "images", 0, "source", "url"))
-            if preview:
-                thumbnail = preview.replace("&amp;", "&")
+            preview_images = (children.get("preview") or {}).get("images")
+            if preview_images:
+                thumbnail = (preview_images[0].get("source") or {}).get("url")
 
         if not formats:
             raise ExtractionError(
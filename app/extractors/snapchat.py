@@ -10,6 +10,7 @@ Supports:
 """
 
 import logging
+import re
 
 from ..models.enums import FormatType, Platform
 from ..models.request import ExtractRequest
@@ -40,12 +41,43 @@ _SNAPCHAT_HEADERS = {
     "Accept-Language": "en-US,en;q=0.9",
 }
 
+_STORY_URL_RE = re.compile(r"/stories/|story\.snapchat\.com")
+
+# HTML fallbacks when __NEXT_DATA__ has no usable story. One alternation so the
+# page is scanned once; the named group that matched says which field it was.
+_SPOTLIGHT_FIELDS_RE = re.compile(
+    r'<link\s+rel="preload"\s+href="(?P<preload>[^"]+)"\s+as="video"'
+    r'|"contentUrl"\s*:\s*"(?P<content_url>[^"]+)"'
+    r'|<video[^>]+src="(?P<video_src>[^"]+)"'
+    r"|<title>(?P<title>[^<]+)</title>"
+    r'|"thumbnailUrl"\s*:\s*"(?P<thumbnail>[^"]+)"'
+    r'|<meta\s+property="og:image"\s+content="(?P<og_image>[^"]+)"'
+    r'|"description"\s*:\s*"(?P<description>[^"]*)"'
+)
+_SPOTLIGHT_FIELD_COUNT = _SPOTLIGHT_FIELDS_RE.groups
+
+
+def _scan_spotlight_fields(html: str) -> dict[str, str]:
+    """First occurrence of each _SPOTLIGHT_FIELDS_RE field, in a single pass."""
+    fields: dict[str, str] = {}
+    for match in _SPOTLIGHT_FIELDS_RE.finditer(html):
+        name = match.lastgroup
+        if name not in fields:
+            fields[name] = match.group(name)
+            if len(fields) == _SPOTLIGHT_FIELD_COUNT:
+                break
+    return fields
+
 
 class SnapchatExtractor(BaseExtractor):
     """Snapchat media extractor."""
 
     platform = Platform.SNAPCHAT
 
+    # Repeat lookups reuse the result instead of re-fetching and re-parsing
+    # __NEXT_DATA__; kept short since media URLs are signed
+    _response_cache_ttl = 120
+
     async def _extract(
         self,
         media_id: str,
@@ -54,15 +86,11 @@ class SnapchatExtractor(BaseExtractor):
         params: dict[str, str],
     ) -> ExtractResponse:
         """Extract media from Snapchat."""
-        # Determine content type from URL
-        if "/spotlight/" in url:
-            return await self._extract_spotlight(media_id, url)
-        elif "/stories/" in url or "story.snapchat.com" in url:
+        # Stories have their own page layout; spotlight, /p/ and anything
+        # else go through the spotlight parser (spotlight wins if both match)
+        if "/spotlight/" not in url and _STORY_URL_RE.search(url):
             return await self._extract_story(media_id, url, params)
-        elif "/p/" in url:
-            return await self._extract_spotlight(media_id, url)
-        else:
-            return await self._extract_spotlight(media_id, url)
+        return await self._extract_spotlight(media_id, url)
 
     async def _extract_spotlight(self, media_id: str, url: str) -> ExtractResponse:
         """Extract from Snapchat Spotlight."""
@@ -94,30 +122,9 @@ class SnapchatExtractor(BaseExtractor):
             if story:
                 return self._parse_story_data(story, media_id)
 
-        # Method 2: Extract video preload link (cobalt approach)
-        video_url = self._search_regex(
-            r'<link\s+rel="preload"\s+href="([^"]+)"\s+as="video"',
-            html,
-            "preload video",
-            default=None,
-        )
-
-        if not video_url:
-            # Try alternate patterns
-            video_url = self._search_regex(
-                r'"contentUrl"\s*:\s*"([^"]+)"',
-                html,
-                "content URL",
-                default=None,
-            )
-
-        if not video_url:
-            video_url = self._search_regex(
-                r'<video[^>]+src="([^"]+)"',
-                html,
-                "video src",
-                default=None,
-            )
+        # Method 2: scrape the HTML (preload link as in cobalt, then fallbacks)
+        fields = _scan_spotlight_fields(html)
+        video_url = fields.get("preload") or fields.get("content_url") or fields.get("video_src")
 
         if not video_url:
             raise ExtractionError(
@@ -128,29 +135,8 @@ class SnapchatExtractor(BaseExtractor):
         # Clean URL
         video_url = video_url.replace("&amp;", "&")
 
-        # Get title
-        title = self._search_regex(
-            r"<title>([^<]+)</title>",
-            html,
-            "title",
-            default="Snapchat Spotlight",
-        )
-        title = clean_html(title)
-
-        # Get thumbnail
-        thumbnail = self._search_regex(
-            r'"thumbnailUrl"\s*:\s*"([^"]+)"',
-            html,
-            "thumbnail",
-            default=None,
-        )
-        if not thumbnail:
-            thumbnail = self._search_regex(
-                r'<meta\s+property="og:image"\s+content="([^"]+)"',
-                html,
-                "og:image",
-                default=None,
-            )
+        title = clean_html(fields.get("title") or "Snapchat Spotlight")
+        thumbnail = fields.get("thumbnail") or fields.get("og_image")
 
         formats = [
             FormatInfo(
@@ -161,13 +147,7 @@ class SnapchatExtractor(BaseExtractor):
             )
         ]
 
-        # Try to get description
-        description = self._search_regex(
-            r'"description"\s*:\s*"([^"]*)"',
-            html,
-            "description",
-            default=None,
-        )
+        description = fields.get("description")
 
         metadata = None
         if description:
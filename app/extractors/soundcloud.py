@@ -9,9 +9,11 @@ Supports:
 - Client ID extraction from SoundCloud JS
 """
 
+import asyncio
 import logging
 import re
 
+from ..core.cache import TTLCache
 from ..models.enums import FormatType, Platform
 from ..models.request import ExtractRequest
 from ..models.response import (
@@ -23,7 +25,7 @@ from ..utils.helpers import (
     float_or_none,
     format_date,
     int_or_none,
-    traverse_obj,
+    json_loads,
 )
 from .base import BaseExtractor, ExtractionError
 
@@ -44,12 +46,62 @@ _SC_HEADERS = {
     "Referer": "https://soundcloud.com/",
 }
 
+# What an on.soundcloud.com short link must resolve to: soundcloud.com/<user>/<slug>
+_SC_TRACK_URL_RE = re.compile(r"^https?://(?:www\.|m\.)?soundcloud\.com/[^/?#]+/[^/?#]+")
+
+_SC_SCRIPT_RE = re.compile(r'src="(https://a-v2\.sndcdn\.com/assets/[^"]+\.js)"')
+_SC_CID_QUOTED_RE = re.compile(r'client_id\s*:\s*"([a-zA-Z0-9]{32})"')
+_SC_CID_QS_RE = re.compile(r"client_id=([a-zA-Z0-9]{32})")
+_SC_VER_RE = re.compile(r'__sc_version\s*=\s*"(\d+)"')
+
+# JS bundles downloaded at once while looking for the client_id
+_SC_SCRIPT_BATCH = 4
+
+# Client IDs rotate with SoundCloud deploys, which bump __sc_version
+_CLIENT_ID_TTL = 6 * 3600
+
+_SC_CODEC_PRIORITY = {"opus": 3, "mp3": 2, "aac": 1}
+
+
+def _sc_codec_key(fmt: FormatInfo) -> int:
+    return _SC_CODEC_PRIORITY.get(fmt.acodec or "", 0)
+
+
+def _sc_client_id(js_content: str) -> str | None:
+    match = _SC_CID_QUOTED_RE.search(js_content) or _SC_CID_QS_RE.search(js_content)
+    return match.group(1) if match else None
+
 
 class SoundCloudExtractor(BaseExtractor):
     """SoundCloud media extractor."""
 
     platform = Platform.SOUNDCLOUD
-    _client_id: str | None = None
+
+    # Stream URLs from the transcoding endpoints carry short-lived signatures.
+    # Track slugs are only unique per user; see _response_cache_key.
+    _response_cache_ttl = 120
+
+    # Short link (without query) -> resolved URL, shared across requests
+    _redirect_cache = TTLCache(maxsize=4096, ttl=86400)
+
+    # -> (client_id, __sc_version); shared across requests
+    _client_id_cache = TTLCache(maxsize=1, ttl=_CLIENT_ID_TTL)
+
+    # Last client_id found and the __sc_version it was found under. Outlives
+    # the cache entry so an expired ID can be revalidated without the JS walk.
+    _known_client_id: tuple[str, str | None] | None = None
+
+    def _response_cache_key(
+        self,
+        media_id: str,
+        url: str,
+        request: ExtractRequest,
+        params: dict[str, str],
+    ) -> tuple | None:
+        """Only cache a track slug together with its user (short-link IDs are unique)."""
+        if not params.get("user") and "on.soundcloud.com" not in url:
+            return None
+        return super()._response_cache_key(media_id, url, request, params)
 
     async def _extract(
         self,
@@ -65,8 +117,11 @@ class SoundCloudExtractor(BaseExtractor):
         # Resolve short links
         if "on.soundcloud.com" in url:
             try:
-                resolved = await self.http.resolve_redirect(url)
-                url = resolved
+                short_url = url.split("?", 1)[0]
+                # Only a track URL is cached; failures raise
+                url = await self._redirect_cache.get_or_load(
+                    short_url, lambda: self._resolve_short_link(url, _SC_TRACK_URL_RE)
+                )
             except Exception as e:
                 logger.warning(f"Failed to resolve SoundCloud short link: {e}")
 
@@ -95,13 +150,16 @@ class SoundCloudExtractor(BaseExtractor):
             params=params_dict,
         )
 
+        if response.status_code in (401, 403):
+            # Most likely a rotated client_id; make the next request rediscover it
+            self._invalidate_client_id()
         if response.status_code != 200:
             raise ExtractionError(
                 f"SoundCloud resolve API returned {response.status_code}",
                 error_code="soundcloud.resolve_failed",
             )
 
-        track_data = response.json()
+        track_data = json_loads(response.content)
 
         if track_data.get("kind") != "track":
             raise ExtractionError(
@@ -112,13 +170,27 @@ class SoundCloudExtractor(BaseExtractor):
         return await self._parse_track(track_data, client_id)
 
     async def _get_client_id(self) -> str | None:
+        """Return the shared SoundCloud client_id, discovering it on a cache miss."""
+        client_id, _ = await self._client_id_cache.get_or_load(
+            "client_id",
+            self._fetch_client_id,
+            ttl=lambda entry: _CLIENT_ID_TTL if entry[0] else 0,
+        )
+        return client_id
+
+    def _invalidate_client_id(self):
+        self._client_id_cache.clear()
+        SoundCloudExtractor._known_client_id = None
+
+    async def _fetch_client_id(self) -> tuple[str | None, str | None]:
         """
         Extract SoundCloud client_id from their JavaScript files.
         Ported from cobalt's soundcloud.js and yt-dlp's soundcloud.py.
-        """
-        if self._client_id:
-            return self._client_id
 
+        The homepage's __sc_version changes with each deploy; if it still
+        matches the version the last client_id was found under, that ID is
+        reused without downloading any JS.
+        """
         try:
             # Fetch homepage to get JS file URLs
             homepage = await self._download_webpage(
@@ -126,49 +198,43 @@ class SoundCloudExtractor(BaseExtractor):
                 headers={"User-Agent": _SC_HEADERS["User-Agent"]},
             )
 
+            version_match = _SC_VER_RE.search(homepage)
+            version = version_match.group(1) if version_match else None
+            known = self._known_client_id
+            if version and known and known[1] == version:
+                return known
+
             # Find script URLs (a-v2.sndcdn.com)
-            script_urls = re.findall(
-                r'src="(https://a-v2\.sndcdn\.com/assets/[^"]+\.js)"',
-                homepage,
-            )
+            script_urls = list(dict.fromkeys(_SC_SCRIPT_RE.findall(homepage)))
 
-            # Also try to get version for cache
-            re.search(r'__sc_version\s*=\s*"(\d+)"', homepage)
-
-            # Search JS files for client_id
-            for script_url in reversed(script_urls):  # Usually in last files
-                try:
-                    js_content = await self._download_webpage(
-                        script_url,
-                        headers={"User-Agent": _SC_HEADERS["User-Agent"]},
-                    )
-                    # Look for client_id pattern
-                    match = re.search(
-                        r'client_id\s*:\s*"([a-zA-Z0-9]{32})"',
-                        js_content,
-                    )
-                    if not match:
-                        match = re.search(
-                            r"client_id=([a-zA-Z0-9]{32})",
-                            js_content,
-                        )
-                    if match:
-                        self._client_id = match.group(1)
-                        logger.info(f"Found SoundCloud client_id: {self._client_id[:8]}...")
-                        return self._client_id
-                except Exception:
-                    continue
+            # Search JS files for client_id; usually in the last files, so scan from the end
+            script_urls.reverse()
+            for i in range(0, len(script_urls), _SC_SCRIPT_BATCH):
+                client_id = await self._scan_scripts(script_urls[i : i + _SC_SCRIPT_BATCH])
+                if client_id:
+                    logger.info(f"Found SoundCloud client_id: {client_id[:8]}...")
+                    SoundCloudExtractor._known_client_id = (client_id, version)
+                    return client_id, version
 
         except Exception as e:
             logger.warning(f"Failed to extract SoundCloud client_id: {e}")
 
-        return None
+        return None, None
+
+    async def _scan_scripts(self, script_urls: list[str]) -> str | None:
+        """Download JS bundles concurrently; return the first client_id found."""
+        headers = {"User-Agent": _SC_HEADERS["User-Agent"]}
+        return await self._first_result(
+            {f"script {u}": self._download_webpage(u, headers=headers) for u in script_urls},
+            accept=_sc_client_id,
+        )
 
     async def _parse_track(self, track: dict, client_id: str) -> ExtractResponse:
         """Parse SoundCloud track data into ExtractResponse."""
         track_id = str(track.get("id", ""))
         title = track.get("title", "")
         duration = float_or_none(track.get("duration"), scale=1000)
+        user = track.get("user") or {}
 
         # Get artwork
         artwork_url = track.get("artwork_url") or ""
@@ -176,20 +242,27 @@ class SoundCloudExtractor(BaseExtractor):
             # Replace size for higher quality
             thumbnail = artwork_url.replace("-large", "-t500x500")
         else:
-            thumbnail = traverse_obj(track, ("user", "avatar_url"))
+            thumbnail = user.get("avatar_url")
 
         # Extract transcoding formats
         formats = []
-        transcodings = traverse_obj(track, ("media", "transcodings")) or []
+        transcodings = (track.get("media") or {}).get("transcodings") or []
         track_auth = track.get("track_authorization", "")
 
-        for tc in transcodings:
-            tc_url = tc.get("url")
-            if not tc_url:
-                continue
+        # Skip DRM-protected or snipped content
+        playable = [
+            tc
+            for tc in transcodings
+            if tc.get("url") and not (tc.get("snipped") or tc.get("is_snipped"))
+        ]
 
-            # Skip DRM-protected or snipped content
-            if tc.get("snipped") or tc.get("is_snipped"):
+        # Each transcoding needs its own round trip for the stream URL; do them concurrently
+        stream_urls = await asyncio.gather(
+            *(self._get_stream_url(tc["url"], client_id, track_auth) for tc in playable)
+        )
+
+        for tc, stream_url in zip(playable, stream_urls):
+            if not stream_url:
                 continue
 
             # Get format info
@@ -202,6 +275,7 @@ class SoundCloudExtractor(BaseExtractor):
             # Determine codec and extension
             ext = "mp3"
             acodec = "mp3"
+            mime_type = mime_type.lower()
             if "opus" in preset.lower() or "opus" in mime_type:
                 ext = "opus"
                 acodec = "opus"
@@ -209,11 +283,6 @@ class SoundCloudExtractor(BaseExtractor):
                 ext = "m4a"
                 acodec = "aac"
 
-            # Get the actual stream URL
-            stream_url = await self._get_stream_url(tc_url, client_id, track_auth)
-            if not stream_url:
-                continue
-
             formats.append(
                 FormatInfo(
                     url=stream_url,
@@ -234,14 +303,9 @@ class SoundCloudExtractor(BaseExtractor):
             )
 
         # Sort formats: prefer opus > mp3 > aac
-        codec_priority = {"opus": 3, "mp3": 2, "aac": 1}
-        formats.sort(
-            key=lambda f: codec_priority.get(f.acodec or "", 0),
-            reverse=True,
-        )
+        formats.sort(key=_sc_codec_key, reverse=True)
 
         # Build metadata
-        user = track.get("user", {})
         metadata = MediaMetadata(
             uploader=user.get("username"),
             uploader_id=str(user.get("id", "")),
@@ -282,7 +346,7 @@ class SoundCloudExtractor(BaseExtractor):
                 params=params,
             )
             if response.status_code == 200:
-                data = response.json()
+                data = json_loads(response.content)
                 return data.get("url")
         except Exception as e:
             logger.debug(f"Failed to get stream URL: {e}")
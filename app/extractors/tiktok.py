@@ -11,7 +11,9 @@ Supports:
 
 import logging
 import re
+from collections.abc import Mapping
 
+from ..core.cache import TTLCache
 from ..models.enums import FormatType, Platform
 from ..models.request import ExtractRequest
 from ..models.response import (
@@ -20,11 +22,11 @@ from ..models.response import (
     MediaMetadata,
 )
 from ..utils.helpers import (
-    extract_json_from_html,
-    extract_json_from_script,
+    extract_json_any,
     float_or_none,
     format_date,
     int_or_none,
+    json_loads,
     traverse_obj,
 )
 from .base import BaseExtractor, ExtractionError
@@ -42,12 +44,64 @@ _TIKTOK_HEADERS = {
     "Referer": "https://www.tiktok.com/",
 }
 
+_TT_VIDEO_ID_RE = re.compile(r"/(?:video|photo)/(\d+)")
+
+_TT_SCRIPT_ID = b'id="__UNIVERSAL_DATA_FOR_REHYDRATION__"'
+
+
+def _find_rehydration_script(content: bytes) -> bytes | None:
+    """
+    Slice the __UNIVERSAL_DATA_FOR_REHYDRATION__ script body out of the raw
+    page with plain bytes.find, so the whole page need not be decoded.
+    """
+    start = content.find(_TT_SCRIPT_ID)
+    if start == -1:
+        return None
+    start = content.find(b">", start) + 1
+    end = content.find(b"</script>", start)
+    if not start or end == -1:
+        return None
+    return content[start:end]
+
+
+# Hydration payloads of the current web app and the legacy SIGI_STATE one
+_TT_DATA_NAMES = ("__UNIVERSAL_DATA_FOR_REHYDRATION__", "SIGI_STATE")
+
 
 class TikTokExtractor(BaseExtractor):
     """TikTok media extractor."""
 
     platform = Platform.TIKTOK
 
+    # Play URLs are signed and expire within hours; a short TTL absorbs bursts on
+    # popular videos without handing out stale links
+    _response_cache_ttl = 120
+
+    # Short link (without query) -> resolved URL, shared across requests
+    _redirect_cache = TTLCache(maxsize=4096, ttl=86400)
+
+    def __init__(self):
+        super().__init__()
+        # (cookie generation, headers) for _page_headers()
+        self._page_headers_cache: tuple[int, dict[str, str]] | None = None
+
+    def _page_headers(self) -> Mapping[str, str]:
+        """
+        Headers for TikTok page requests, with the cookie jar when
+        available. The cookie overlay is built once per cookie generation
+        and must not be mutated by callers.
+        """
+        if not self._has_cookies():
+            return _TIKTOK_HEADERS
+
+        generation = self._cookies.generation
+        if self._page_headers_cache and self._page_headers_cache[0] == generation:
+            return self._page_headers_cache[1]
+
+        headers = {**_TIKTOK_HEADERS, "Cookie": self._get_cookie_header()}
+        self._page_headers_cache = (generation, headers)
+        return headers
+
     async def _extract(
         self,
         media_id: str,
@@ -59,16 +113,15 @@ class TikTokExtractor(BaseExtractor):
         # Resolve short links
         if any(d in url for d in ("vm.tiktok.com", "vt.tiktok.com")):
             try:
-                resolved_url = await self.http.resolve_redirect(url)
-                url = resolved_url
+                short_url = url.split("?", 1)[0]
+                # Only a URL with a video/photo ID is cached; failures raise
+                url = await self._redirect_cache.get_or_load(
+                    short_url, lambda: self._resolve_short_link(url, _TT_VIDEO_ID_RE)
+                )
                 # Re-extract video ID from resolved URL
-                id_match = re.search(r"/video/(\d+)", url)
+                id_match = _TT_VIDEO_ID_RE.search(url)
                 if id_match:
                     media_id = id_match.group(1)
-                else:
-                    id_match = re.search(r"/photo/(\d+)", url)
-                    if id_match:
-                        media_id = id_match.group(1)
             except Exception as e:
                 logger.warning(f"Failed to resolve TikTok short link: {e}")
 
@@ -99,7 +152,8 @@ class TikTokExtractor(BaseExtractor):
         Tries multiple URL patterns (like Cobalt: @i/video) and does not hard-fail on /login
         redirect; falls back to embed and other methods before raising.
         """
-        # Cobalt uses @i/video unconditionally for the main request; we try user URL first then @i
+        # Cobalt uses @i/video unconditionally for the main request; we also try the user URL
+        # and the original URL, fetching all of them concurrently
         urls_to_try = []
         if user:
             urls_to_try.append(f"https://www.tiktok.com/@{user}/video/{video_id}")
@@ -107,26 +161,10 @@ class TikTokExtractor(BaseExtractor):
         if url and "tiktok.com" in url and url not in urls_to_try:
             urls_to_try.append(url)
 
-        headers = dict(_TIKTOK_HEADERS)
-        if self._has_cookies():
-            headers["Cookie"] = self._get_cookie_header()
-
-        universal_data = None
-        html = None
-        for page_url in urls_to_try:
-            response = await self.http.get(page_url, headers=headers)
-            html = response.text
-            universal_data = extract_json_from_html(html, "__UNIVERSAL_DATA_FOR_REHYDRATION__")
-            if not universal_data:
-                universal_data = extract_json_from_html(html, "SIGI_STATE")
-            if not universal_data:
-                universal_data = extract_json_from_script(
-                    html, "__UNIVERSAL_DATA_FOR_REHYDRATION__"
-                )
-            if not universal_data:
-                universal_data = extract_json_from_script(html, "SIGI_STATE")
-            if universal_data:
-                break
+        headers = self._page_headers()
+        universal_data = await self._first_result(
+            {f"page {u}": self._fetch_page_data(u, headers) for u in urls_to_try}
+        )
 
         if not universal_data:
             try:
@@ -135,7 +173,8 @@ class TikTokExtractor(BaseExtractor):
                 pass
             raise ExtractionError("Could not find video data in TikTok page")
 
-        video_detail = traverse_obj(universal_data, ("__DEFAULT_SCOPE__", "webapp.video-detail"))
+        scope = universal_data.get("__DEFAULT_SCOPE__") or {}
+        video_detail = scope.get("webapp.video-detail")
         if isinstance(video_detail, dict):
             status_msg = video_detail.get("statusMsg") or video_detail.get("status_msg")
             status_code = int_or_none(video_detail.get("statusCode"))
@@ -158,29 +197,21 @@ class TikTokExtractor(BaseExtractor):
                 raise ExtractionError("Private account", error_code="tiktok.private_account")
 
         # Navigate to video data
-        # New format: __DEFAULT_SCOPE__["webapp.video-detail"]
-        video_data = traverse_obj(
-            universal_data,
-            ("__DEFAULT_SCOPE__", "webapp.video-detail", "itemInfo", "itemStruct"),
-        )
-
-        if not video_data:
-            # Try alternate path
-            video_data = traverse_obj(
-                universal_data,
-                ("__DEFAULT_SCOPE__", "webapp.video-detail", "itemStruct"),
-            )
+        video_data = None
+        if isinstance(video_detail, dict):
+            # New format: __DEFAULT_SCOPE__["webapp.video-detail"]
+            video_data = (video_detail.get("itemInfo") or {}).get("itemStruct")
+            if not video_data:
+                # Try alternate path
+                video_data = video_detail.get("itemStruct")
 
         if not video_data:
             # Try SIGI_STATE path
-            video_data = traverse_obj(
-                universal_data,
-                ("ItemModule", video_id),
-            )
+            video_data = (universal_data.get("ItemModule") or {}).get(video_id)
 
         if not video_data:
             # Try to find any video structure
-            for _key, value in universal_data.get("__DEFAULT_SCOPE__", {}).items():
+            for value in scope.values():
                 if isinstance(value, dict):
                     vd = traverse_obj(value, ("itemInfo", "itemStruct"))
                     if vd:
@@ -195,12 +226,22 @@ class TikTokExtractor(BaseExtractor):
 
         return self._parse_video_data(video_data, video_id)
 
+    async def _fetch_page_data(self, page_url: str, headers: Mapping[str, str]) -> dict | None:
+        """GET one TikTok page and pull out its hydration JSON."""
+        response = await self.http.get(page_url, headers=headers)
+        script = _find_rehydration_script(response.content)
+        if script:
+            try:
+                return json_loads(script)
+            except ValueError:
+                pass
+        return extract_json_any(response.text, _TT_DATA_NAMES)
+
     async def _extract_from_embed(self, video_id: str) -> ExtractResponse:
         """Extract data from TikTok embed page."""
         embed_url = f"https://www.tiktok.com/embed/v2/{video_id}"
 
-        headers = dict(_TIKTOK_HEADERS)
-        html = await self._download_webpage(embed_url, headers=headers)
+        html = await self._download_webpage(embed_url, headers=_TIKTOK_HEADERS)
 
         # Extract video data from embed
         video_data = self._search_json(r'"videoData"\s*:', html, "video data", default=None)
@@ -213,6 +254,7 @@ class TikTokExtractor(BaseExtractor):
     def _parse_video_data(self, data: dict, video_id: str) -> ExtractResponse:
         """Parse TikTok video data into ExtractResponse."""
         formats = []
+        urls_seen: set[str] = set()
 
         # Check if this is a slideshow/image post
         image_post = data.get("imagePost") or data.get("photo")
@@ -248,13 +290,13 @@ class TikTokExtractor(BaseExtractor):
 
         # Add bitrate variants
         for br_info in bitrate_info:
-            br_url = traverse_obj(br_info, ("PlayAddr", "UrlList", -1)) or traverse_obj(
-                br_info, ("PlayAddr", "UrlList", 0)
-            )
-            if not br_url:
-                br_url = addr_to_url(br_info.get("play_addr") or br_info.get("PlayAddr"))
+            play = br_info.get("PlayAddr")
+            br_url = addr_to_url(play) or addr_to_url(br_info.get("play_addr"))
             if br_url:
+                dims = play if isinstance(play, dict) else {}
+                urls_seen.add(br_url)
                 codec = br_info.get("CodecType", "")
+                codec_l = codec.lower()
                 gear = br_info.get("GearName", "")
 
                 formats.append(
@@ -262,11 +304,9 @@ class TikTokExtractor(BaseExtractor):
                         url=br_url,
                         format_id=f"{gear}_{codec}" if gear else None,
                         ext="mp4",
-                        width=int_or_none(traverse_obj(br_info, ("PlayAddr", "Width"))),
-                        height=int_or_none(traverse_obj(br_info, ("PlayAddr", "Height"))),
-                        vcodec="h265"
-                        if "h265" in codec.lower() or "bytevc1" in codec.lower()
-                        else "h264",
+                        width=int_or_none(dims.get("Width")),
+                        height=int_or_none(dims.get("Height")),
+                        vcodec="h265" if "h265" in codec_l or "bytevc1" in codec_l else "h264",
                         acodec="mp4a",
                         tbr=float_or_none(br_info.get("Bitrate"), scale=1000),
                         format_type=FormatType.COMBINED,
@@ -283,6 +323,7 @@ class TikTokExtractor(BaseExtractor):
             ):
                 play_url = addr_to_url(addr)
                 if play_url:
+                    urls_seen.add(play_url)
                     formats.append(
                         FormatInfo(
                             url=play_url,
@@ -298,7 +339,7 @@ class TikTokExtractor(BaseExtractor):
         if download_addr:
             dl_url = addr_to_url(download_addr)
 
-            if dl_url and not any(f.url == dl_url for f in formats):
+            if dl_url and dl_url not in urls_seen:
                 formats.append(
                     FormatInfo(
                         url=dl_url,
@@ -10,6 +10,7 @@ Supports:
 """
 
 import logging
+import re
 
 from ..models.enums import FormatType, Platform
 from ..models.request import ExtractRequest
@@ -22,6 +23,7 @@ from ..utils.helpers import (
     float_or_none,
     format_date,
     int_or_none,
+    json_loads,
     parse_m3u8_attributes,
     traverse_obj,
 )
@@ -32,6 +34,19 @@ logger = logging.getLogger(__name__)
 _TWITCH_GQL = "https://gql.twitch.tv/gql"
 _TWITCH_CLIENT_ID = "kimne78kx3ncx6brgo4mv6wki5h1ko"
 
+_TWITCH_HEADERS = {
+    "Client-ID": _TWITCH_CLIENT_ID,
+    "Content-Type": "application/json",
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/131.0.0.0 Safari/537.36"
+    ),
+}
+
+# VOD URLs (twitch.tv/videos/<digits>); anything else is a clip
+_VOD_URL_RE = re.compile(r"twitch\.tv/videos/\d", re.IGNORECASE)
+
 # GraphQL query hashes (from cobalt's twitch.js)
 _CLIP_QUERY_HASH = "36b89d2507fce29e5ca551df756d27c1cfe079e2609642b4390aa4c35796eb11"
 
@@ -41,6 +56,9 @@ class TwitchExtractor(BaseExtractor):
 
     platform = Platform.TWITCH
 
+    # Clip and VOD URLs embed a playback access token valid far longer than this
+    _response_cache_ttl = 300
+
     async def _extract(
         self,
         media_id: str,
@@ -50,13 +68,12 @@ class TwitchExtractor(BaseExtractor):
     ) -> ExtractResponse:
         """Extract media from Twitch."""
         # Determine if this is a clip or VOD
-        if "/videos/" in url:
+        if _VOD_URL_RE.search(url):
             return await self._extract_vod(media_id, url)
-        else:
-            return await self._extract_clip(media_id, url, params)
+        return await self._extract_clip(media_id, url, params, include_sizes=request.include_sizes)
 
     async def _extract_clip(
-        self, clip_slug: str, url: str, params: dict[str, str]
+        self, clip_slug: str, url: str, params: dict[str, str], include_sizes: bool = False
     ) -> ExtractResponse:
         """Extract a Twitch clip."""
         # Step 1: Get clip metadata via GraphQL
@@ -83,19 +100,9 @@ class TwitchExtractor(BaseExtractor):
             },
         ]
 
-        headers = {
-            "Client-ID": _TWITCH_CLIENT_ID,
-            "Content-Type": "application/json",
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
-        }
-
         response = await self.http.post(
             _TWITCH_GQL,
-            headers=headers,
+            headers=_TWITCH_HEADERS,
             json=gql_payload,
         )
 
@@ -105,7 +112,7 @@ class TwitchExtractor(BaseExtractor):
                 error_code="twitch.gql_failed",
             )
 
-        gql_data = response.json()
+        gql_data = json_loads(response.content)
 
         if not isinstance(gql_data, list) or len(gql_data) < 2:
             raise ExtractionError("Invalid Twitch GraphQL response")
@@ -161,10 +168,14 @@ class TwitchExtractor(BaseExtractor):
                 error_code="twitch.no_formats",
             )
 
+        if include_sizes:
+            await self._probe_filesizes(formats)
+
         # Build metadata
-        broadcaster = clip_data.get("broadcaster", {})
-        curator = clip_data.get("curator", {})
-        game = clip_data.get("game", {})
+        broadcaster = clip_data.get("broadcaster") or {}
+        login = broadcaster.get("login")
+        curator_name = traverse_obj(clip_data, ("curator", "displayName"))
+        game_name = traverse_obj(clip_data, ("game", "name"))
 
         title = clip_data.get("title", "Twitch Clip")
         duration = float_or_none(clip_data.get("durationSeconds"))
@@ -172,12 +183,12 @@ class TwitchExtractor(BaseExtractor):
 
         metadata = MediaMetadata(
             uploader=broadcaster.get("displayName"),
-            uploader_id=broadcaster.get("login"),
-            uploader_url=f"https://twitch.tv/{broadcaster.get('login', '')}",
-            description=f"Clipped by {curator.get('displayName', 'unknown')}",
+            uploader_id=login,
+            uploader_url=f"https://twitch.tv/{login or ''}",
+            description=f"Clipped by {curator_name or 'unknown'}",
             view_count=int_or_none(clip_data.get("viewCount")),
             upload_date=format_date(clip_data.get("createdAt")),
-            categories=[game.get("name")] if game.get("name") else None,
+            categories=[game_name] if game_name else None,
         )
 
         return ExtractResponse(
@@ -192,36 +203,46 @@ class TwitchExtractor(BaseExtractor):
 
     async def _extract_vod(self, vod_id: str, url: str) -> ExtractResponse:
         """Extract a Twitch VOD."""
-        # Get access token for VOD
-        gql_payload = {
-            "operationName": "PlaybackAccessToken",
-            "extensions": {
-                "persistedQuery": {
-                    "sha256Hash": "ed230aa1e33a07eafc741f4b0145a3bfe57a9ec2",
-                    "version": 1,
-                }
+        # Access token and VOD info in one batched GQL request
+        gql_payload = [
+            {
+                "operationName": "PlaybackAccessToken",
+                "extensions": {
+                    "persistedQuery": {
+                        "sha256Hash": "ed230aa1e33a07eafc741f4b0145a3bfe57a9ec2",
+                        "version": 1,
+                    }
+                },
+                "variables": {
+                    "isLive": False,
+                    "login": "",
+                    "isVod": True,
+                    "vodID": vod_id,
+                    "playerType": "embed",
+                },
             },
-            "variables": {
-                "isLive": False,
-                "login": "",
-                "isVod": True,
-                "vodID": vod_id,
-                "playerType": "embed",
+            {
+                "operationName": "VideoMetadata",
+                "extensions": {
+                    "persistedQuery": {
+                        "sha256Hash": "45111672eea2e507f8ba44d101a61862f9c56b11",
+                        "version": 1,
+                    }
+                },
+                "variables": {"channelLogin": "", "videoID": vod_id},
             },
-        }
-
-        headers = {
-            "Client-ID": _TWITCH_CLIENT_ID,
-            "Content-Type": "application/json",
-        }
+        ]
 
-        response = await self.http.post(_TWITCH_GQL, headers=headers, json=gql_payload)
+        response = await self.http.post(_TWITCH_GQL, headers=_TWITCH_HEADERS, json=gql_payload)
 
         if response.status_code != 200:
             raise ExtractionError(f"Twitch GQL returned {response.status_code}")
 
-        data = response.json()
-        token_data = traverse_obj(data, ("data", "videoPlaybackAccessToken"))
+        data = json_loads(response.content)
+        if not isinstance(data, list) or not data:
+            raise ExtractionError("Invalid Twitch GraphQL response")
+
+        token_data = traverse_obj(data[0], ("data", "videoPlaybackAccessToken"))
         if not token_data:
             raise ExtractionError("Could not get VOD access token")
 
@@ -252,40 +273,24 @@ class TwitchExtractor(BaseExtractor):
                 )
             )
 
-        # Get VOD info via GQL
-        info_payload = {
-            "operationName": "VideoMetadata",
-            "extensions": {
-                "persistedQuery": {
-                    "sha256Hash": "45111672eea2e507f8ba44d101a61862f9c56b11",
-                    "version": 1,
-                }
-            },
-            "variables": {"channelLogin": "", "videoID": vod_id},
-        }
-
         title = "Twitch VOD"
         duration = None
         thumbnail = None
         metadata = None
 
-        try:
-            resp = await self.http.post(_TWITCH_GQL, headers=headers, json=info_payload)
-            if resp.status_code == 200:
-                vod_data = traverse_obj(resp.json(), ("data", "video"))
-                if vod_data:
-                    title = vod_data.get("title", title)
-                    duration = float_or_none(vod_data.get("lengthSeconds"))
-                    thumbnail = vod_data.get("previewThumbnailURL")
-                    owner = vod_data.get("owner", {})
-                    metadata = MediaMetadata(
-                        uploader=owner.get("displayName"),
-                        uploader_id=owner.get("login"),
-                        view_count=int_or_none(vod_data.get("viewCount")),
-                        upload_date=format_date(vod_data.get("createdAt")),
-                    )
-        except Exception:
-            pass
+        # VOD info is optional; a missing video just leaves the defaults
+        vod_data = traverse_obj(data, (1, "data", "video"))
+        if isinstance(vod_data, dict):
+            title = vod_data.get("title", title)
+            duration = float_or_none(vod_data.get("lengthSeconds"))
+            thumbnail = vod_data.get("previewThumbnailURL")
+            owner = vod_data.get("owner") or {}
+            metadata = MediaMetadata(
+                uploader=owner.get("displayName"),
+                uploader_id=owner.get("login"),
+                view_count=int_or_none(vod_data.get("viewCount")),
+                upload_date=format_date(vod_data.get("createdAt")),
+            )
 
         return ExtractResponse(
             platform=Platform.TWITCH,
@@ -300,44 +305,43 @@ class TwitchExtractor(BaseExtractor):
     def _parse_hls_playlist(self, content: str, base_url: str) -> list[FormatInfo]:
         """Parse HLS master playlist."""
         formats = []
-        lines = content.strip().split("\n")
-
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            if line.startswith("#EXT-X-STREAM-INF:"):
-                attrs = parse_m3u8_attributes(line.split(":", 1)[1])
-                if i + 1 < len(lines):
-                    stream_url = lines[i + 1].strip()
-
-                    bandwidth = int_or_none(attrs.get("BANDWIDTH"))
-                    resolution = attrs.get("RESOLUTION", "")
-                    video = attrs.get("VIDEO", "")
-
-                    width = None
-                    height = None
-                    if "x" in resolution:
-                        parts = resolution.split("x")
-                        width = int_or_none(parts[0])
-                        height = int_or_none(parts[1])
-
-                    # Determine quality name
-                    quality_name = video or (f"{height}p" if height else "unknown")
-
-                    formats.append(
-                        FormatInfo(
-                            url=stream_url,
-                            format_id=quality_name,
-                            ext="mp4",
-                            width=width,
-                            height=height,
-                            tbr=float_or_none(bandwidth, scale=1000),
-                            protocol="hls",
-                            format_type=FormatType.COMBINED,
-                            quality_label=quality_name,
-                        )
-                    )
-                    i += 1
-            i += 1
+        lines = iter(content.splitlines())
+
+        for line in lines:
+            if not line.startswith("#EXT-X-STREAM-INF:"):
+                continue
+            attrs = parse_m3u8_attributes(line[18:])
+            # The variant URI is the line right after its tag
+            stream_url = next(lines, "").strip()
+            if not stream_url:
+                continue
+
+            bandwidth = int_or_none(attrs.get("BANDWIDTH"))
+            resolution = attrs.get("RESOLUTION", "")
+            video = attrs.get("VIDEO", "")
+
+            width = None
+            height = None
+            if "x" in resolution:
+                w, _, h = resolution.partition("x")
+                width = int_or_none(w)
+                height = int_or_none(h)
+
+            # Determine quality name
+            quality_name = video or (f"{height}p" if height else "unknown")
+
+            formats.append(
+                FormatInfo(
+                    url=stream_url,
+                    format_id=quality_name,
+                    ext="mp4",
+                    width=width,
+                    height=height,
+                    tbr=float_or_none(bandwidth, scale=1000),
+                    protocol="hls",
+                    format_type=FormatType.COMBINED,
+                    quality_label=quality_name,
+                )
+            )
 
         return formats
@@ -10,10 +10,12 @@ Supports:
 - Guest token authentication
 """
 
+import functools
 import json
 import logging
 import re
 
+from ..core.cache import TTLCache
 from ..models.enums import FormatType, Platform
 from ..models.request import ExtractRequest
 from ..models.response import (
@@ -25,6 +27,7 @@ from ..utils.helpers import (
     float_or_none,
     format_date,
     int_or_none,
+    json_loads,
     traverse_obj,
 )
 from .base import BaseExtractor, ExtractionError
@@ -69,13 +72,65 @@ _GRAPHQL_FEATURES = {
     "responsive_web_graphql_timeline_navigation_enabled": True,
     "tweetypie_unmention_optimization_enabled": True,
 }
+_GRAPHQL_FEATURES_JSON = json.dumps(_GRAPHQL_FEATURES, separators=(",", ":"))
+
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/131.0.0.0 Safari/537.36"
+)
+_SYNDICATION_HEADERS = {"User-Agent": _USER_AGENT}
+_AUTH_HEADERS = {"Authorization": f"Bearer {_BEARER_TOKEN}", "User-Agent": _USER_AGENT}
+# Per request, X-Guest-Token (and cookies + CSRF token when available) go on top
+_GRAPHQL_HEADERS = {
+    **_AUTH_HEADERS,
+    "Content-Type": "application/json",
+    "X-Twitter-Active-User": "yes",
+    "X-Twitter-Client-Language": "en",
+}
+
+_RESOLUTION_RE = re.compile(r"/(\d+)x(\d+)/")
+
+_VIDEO_TYPES = frozenset({"video", "animated_gif"})
+
+# FormatInfo fields shared by every MP4 variant of a video / GIF (GIFs are silent)
+_VIDEO_FIELDS = {
+    "ext": "mp4",
+    "vcodec": "avc1",
+    "acodec": "mp4a",
+    "format_type": FormatType.COMBINED,
+}
+_GIF_FIELDS = {**_VIDEO_FIELDS, "acodec": "none", "format_type": FormatType.VIDEO_ONLY}
+
+# Guest tokens are good for a few hours; refresh well before then
+_GUEST_TOKEN_TTL = 2 * 3600
+
+_GUEST_TOKEN_RE = re.compile(rb'"guest_token"\s*:\s*"([^"]+)"')
+
+# GraphQL statuses meaning the guest token was rejected
+_STALE_TOKEN_STATUSES = {401, 403}
+
+
+@functools.lru_cache(maxsize=4096)
+def _generate_syndication_token(tweet_id: str) -> str:
+    """Generate syndication API token."""
+    # The token is derived from the tweet ID
+    # From cobalt's twitter.js and yt-dlp
+    id_int = int(tweet_id)
+    token_value = ((id_int / 1e15) * 3.14159) % 1
+    return f"{token_value:.16f}"[2:]
 
 
 class TwitterExtractor(BaseExtractor):
     """Twitter/X media extractor."""
 
     platform = Platform.TWITTER
-    _guest_token: str | None = None
+
+    # video.twimg.com / pbs.twimg.com URLs are unsigned, so results stay valid
+    _response_cache_ttl = 300
+
+    # Guest token shared across requests; activating one costs a round trip
+    _guest_token_cache = TTLCache(maxsize=1, ttl=_GUEST_TOKEN_TTL)
 
     async def _extract(
         self,
@@ -111,32 +166,24 @@ class TwitterExtractor(BaseExtractor):
 
     async def _get_guest_token(self) -> str:
         """Obtain a guest token for unauthenticated API access."""
-        if self._guest_token:
-            return self._guest_token
-
-        headers = {
-            "Authorization": f"Bearer {_BEARER_TOKEN}",
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
-        }
+        return await self._guest_token_cache.get_or_load("guest", self._activate_guest_token)
 
+    async def _activate_guest_token(self) -> str:
         response = await self.http.post(
             f"{_API_BASE}/1.1/guest/activate.json",
-            headers=headers,
+            headers=_AUTH_HEADERS,
         )
 
         if response.status_code != 200:
             raise ExtractionError("Failed to obtain guest token")
 
-        data = response.json()
-        self._guest_token = data.get("guest_token")
-        if not self._guest_token:
+        # The body is a one-field object; pull the field out without a full parse
+        match = _GUEST_TOKEN_RE.search(response.content)
+        guest_token = match.group(1).decode() if match else None
+        if not guest_token:
             raise ExtractionError("Empty guest token received")
 
-        return self._guest_token
+        return guest_token
 
     async def _fetch_graphql(self, tweet_id: str) -> ExtractResponse | None:
         """Fetch tweet data using GraphQL API."""
@@ -151,22 +198,11 @@ class TwitterExtractor(BaseExtractor):
         }
 
         params = {
-            "variables": json.dumps(variables),
-            "features": json.dumps(_GRAPHQL_FEATURES),
+            "variables": json.dumps(variables, separators=(",", ":")),
+            "features": _GRAPHQL_FEATURES_JSON,
         }
 
-        headers = {
-            "Authorization": f"Bearer {_BEARER_TOKEN}",
-            "X-Guest-Token": guest_token,
-            "Content-Type": "application/json",
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
-            "X-Twitter-Active-User": "yes",
-            "X-Twitter-Client-Language": "en",
-        }
+        headers = {**_GRAPHQL_HEADERS, "X-Guest-Token": guest_token}
 
         if self._has_cookies():
             headers["Cookie"] = self._get_cookie_header()
@@ -181,10 +217,13 @@ class TwitterExtractor(BaseExtractor):
             params=params,
         )
 
+        if response.status_code in _STALE_TOKEN_STATUSES:
+            # Let the next request activate a fresh guest token
+            self._guest_token_cache.pop("guest")
         if response.status_code != 200:
             raise ExtractionError(f"GraphQL API returned {response.status_code}")
 
-        data = response.json()
+        data = json_loads(response.content)
 
         # Navigate to tweet result
         tweet_result = traverse_obj(data, ("data", "tweetResult", "result"))
@@ -192,13 +231,13 @@ class TwitterExtractor(BaseExtractor):
         if not tweet_result:
             raise ExtractionError("No tweet result in GraphQL response")
 
-        # Handle tombstone (deleted/restricted)
-        if tweet_result.get("__typename") == "TweetTombstone":
+        typename = tweet_result.get("__typename")
+        if typename == "TweetTombstone":
+            # Deleted/restricted
             reason = traverse_obj(tweet_result, ("tombstone", "text", "text"))
             raise ExtractionError(f"Tweet unavailable: {reason}")
-
-        # Handle TweetWithVisibilityResults wrapper
-        if tweet_result.get("__typename") == "TweetWithVisibilityResults":
+        if typename == "TweetWithVisibilityResults":
+            # Wrapper around the actual tweet
             tweet_result = tweet_result.get("tweet", tweet_result)
 
         return self._parse_tweet(tweet_result, tweet_id)
@@ -209,38 +248,21 @@ class TwitterExtractor(BaseExtractor):
         params = {
             "id": tweet_id,
             "lang": "en",
-            "token": self._generate_syndication_token(tweet_id),
+            "token": _generate_syndication_token(tweet_id),
         }
 
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
-        }
-
-        response = await self.http.get(url, headers=headers, params=params)
+        response = await self.http.get(url, headers=_SYNDICATION_HEADERS, params=params)
 
         if response.status_code != 200:
             raise ExtractionError(f"Syndication API returned {response.status_code}")
 
-        data = response.json()
+        data = json_loads(response.content)
 
         if not data:
             raise ExtractionError("Empty syndication response")
 
         return self._parse_syndication_tweet(data, tweet_id)
 
-    @staticmethod
-    def _generate_syndication_token(tweet_id: str) -> str:
-        """Generate syndication API token."""
-        # The token is derived from the tweet ID
-        # From cobalt's twitter.js and yt-dlp
-        id_int = int(tweet_id)
-        token_value = ((id_int / 1e15) * 3.14159) % 1
-        return f"{token_value:.16f}"[2:]
-
     def _parse_tweet(self, tweet_result: dict, tweet_id: str) -> ExtractResponse:
         """Parse tweet data from GraphQL response."""
         legacy = tweet_result.get("legacy", tweet_result)
@@ -253,22 +275,21 @@ class TwitterExtractor(BaseExtractor):
         # Get tweet text
         text = legacy.get("full_text", "")
 
-        # Extract media
-        extended_entities = legacy.get("extended_entities", {})
-        media_list = extended_entities.get("media", [])
-
-        if not media_list:
-            # Try entities
-            entities = legacy.get("entities", {})
-            media_list = entities.get("media", [])
+        # Extract media (falling back to plain entities)
+        media_list = (
+            traverse_obj(legacy, ("extended_entities", "media"))
+            or traverse_obj(legacy, ("entities", "media"))
+            or []
+        )
 
         formats = []
         thumbnail = None
+        duration = None
 
         for media_item in media_list:
             media_type = media_item.get("type")
 
-            if media_type == "video" or media_type == "animated_gif":
+            if media_type in _VIDEO_TYPES:
                 # Get thumbnail
                 if not thumbnail:
                     thumbnail = media_item.get("media_url_https")
@@ -276,8 +297,10 @@ class TwitterExtractor(BaseExtractor):
                 # Extract video variants
                 video_info = media_item.get("video_info", {})
                 variants = video_info.get("variants", [])
-                float_or_none(video_info.get("duration_millis"), scale=1000)
+                if duration is None:
+                    duration = float_or_none(video_info.get("duration_millis"), scale=1000)
 
+                variant_fields = _GIF_FIELDS if media_type == "animated_gif" else _VIDEO_FIELDS
                 for variant in variants:
                     content_type = variant.get("content_type", "")
                     if content_type != "video/mp4":
@@ -289,7 +312,7 @@ class TwitterExtractor(BaseExtractor):
                         continue
 
                     # Parse resolution from URL
-                    res_match = re.search(r"/(\d+)x(\d+)/", variant_url)
+                    res_match = _RESOLUTION_RE.search(variant_url)
                     width = int(res_match.group(1)) if res_match else None
                     height = int(res_match.group(2)) if res_match else None
 
@@ -297,15 +320,10 @@ class TwitterExtractor(BaseExtractor):
                         FormatInfo(
                             url=variant_url,
                             format_id=f"mp4_{bitrate}" if bitrate else "mp4",
-                            ext="mp4",
                             width=width,
                             height=height,
                             tbr=float_or_none(bitrate, scale=1000),
-                            vcodec="avc1",
-                            acodec="mp4a" if media_type != "animated_gif" else "none",
-                            format_type=FormatType.COMBINED
-                            if media_type != "animated_gif"
-                            else FormatType.VIDEO_ONLY,
+                            **variant_fields,
                         )
                     )
 
@@ -313,7 +331,7 @@ class TwitterExtractor(BaseExtractor):
                 photo_url = media_item.get("media_url_https")
                 if photo_url:
                     # Get original quality
-                    photo_url = re.sub(r"\?.*$", "", photo_url) + "?format=jpg&name=orig"
+                    photo_url = photo_url.partition("?")[0] + "?format=jpg&name=orig"
                     formats.append(
                         FormatInfo(
                             url=photo_url,
@@ -347,6 +365,7 @@ class TwitterExtractor(BaseExtractor):
             platform=Platform.TWITTER,
             id=tweet_id,
             title=title,
+            duration=duration,
             thumbnail=thumbnail,
             formats=formats,
             metadata=metadata,
@@ -367,7 +386,7 @@ class TwitterExtractor(BaseExtractor):
         for media in media_details:
             media_type = media.get("type")
 
-            if media_type in ("video", "animated_gif"):
+            if media_type in _VIDEO_TYPES:
                 if not thumbnail:
                     thumbnail = media.get("media_url_https")
 
@@ -383,7 +402,7 @@ class TwitterExtractor(BaseExtractor):
                     if not variant_url:
                         continue
 
-                    res_match = re.search(r"/(\d+)x(\d+)/", variant_url)
+                    res_match = _RESOLUTION_RE.search(variant_url)
                     width = int(res_match.group(1)) if res_match else None
                     height = int(res_match.group(2)) if res_match else None
 
@@ -404,7 +423,7 @@ class TwitterExtractor(BaseExtractor):
                 if photo_url:
                     formats.append(
                         FormatInfo(
-                            url=photo_url + "?format=jpg&name=orig",
+                            url=photo_url.partition("?")[0] + "?format=jpg&name=orig",
                             ext="jpg",
                             format_type=FormatType.COMBINED,
                         )
@@ -10,10 +10,15 @@ Supports:
 - OAuth bearer token authentication
 """
 
+import asyncio
+import base64
+import functools
 import logging
+import re
 from urllib.parse import unquote
 
 from ..config import get_settings
+from ..core.cache import TTLCache
 from ..core.dash_parser import parse_mpd
 from ..models.enums import FormatType, Platform
 from ..models.request import ExtractRequest
@@ -26,9 +31,11 @@ from ..utils.helpers import (
     float_or_none,
     format_date,
     int_or_none,
+    json_loads,
     parse_m3u8_attributes,
     str_or_none,
     traverse_obj,
+    unescape_js_url,
 )
 from .base import BaseExtractor, ExtractionError
 
@@ -44,6 +51,49 @@ _VIMEO_CLIENT_SECRET_DEFAULT = (
     "wFBPUKcKJrRZNKK/2MK3YIHQ3BnCpDWEYPTNbf7RlC56SmCdBbUKJUhOjGk"
 )
 
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+)
+_VIMEO_ACCEPT = "application/vnd.vimeo.*+json;version=3.4.10"
+
+# Constant parts of the /videos request; only Authorization and password vary
+_API_HEADERS = {"Accept": _VIMEO_ACCEPT, "User-Agent": _USER_AGENT}
+_VIDEO_PARAMS = {
+    "fields": (
+        "uri,name,description,duration,width,height,created_time,"
+        "modified_time,pictures,files,download,play,status,"
+        "user,metadata,stats,categories,tags,config_url,embed_player_config_url"
+    ),
+}
+
+# API statuses with a specific error; any other non-200 is "vimeo.api_error"
+_STATUS_ERRORS = {
+    403: ("Video is private or password-protected", "vimeo.forbidden"),
+    404: ("Video not found", "vimeo.not_found"),
+}
+
+_TOKEN_FORM = {
+    "grant_type": "client_credentials",
+    "scope": "private public create edit delete interact upload purchased stats video_files",
+}
+
+# Client-credentials tokens are long-lived; expires_in is honoured when present
+_TOKEN_DEFAULT_TTL = 86400
+_TOKEN_EXPIRY_MARGIN = 60
+
+# A variant's attribute line paired with the URI line that follows it
+_STREAM_INF_RE = re.compile(r"^#EXT-X-STREAM-INF:([^\r\n]*)\r?\n([^\r\n]+)", re.MULTILINE)
+
+# Player page: the config URL as an HTML attribute, or inside the embedded JSON
+_CONFIG_URL_ATTR_RE = re.compile(r'data-config-url="([^"]+)"')
+_CONFIG_URL_JSON_RE = re.compile(r'"config_url"\s*:\s*"([^"]+)"')
+
+# FormatInfo fields shared by HLS renditions, unexpanded HLS masters and DASH manifests
+_HLS_FIELDS = {"ext": "mp4", "protocol": "hls", "format_type": FormatType.COMBINED}
+_HLS_MASTER_FIELDS = {**_HLS_FIELDS, "quality_label": "HLS"}
+_DASH_MANIFEST_FIELDS = {"ext": "mpd", "protocol": "dash", "format_type": FormatType.COMBINED}
+
 # Resolution mapping (from cobalt)
 _RESOLUTION_MAP = {
     3840: 2160,
@@ -57,11 +107,19 @@ _RESOLUTION_MAP = {
 }
 
 
+@functools.lru_cache(maxsize=4)
+def _basic_auth_header(client_id: str, client_secret: str) -> str:
+    """Basic auth header for the client-credentials grant (credentials are static)."""
+    return "Basic " + base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
+
+
 class VimeoExtractor(BaseExtractor):
     """Vimeo media extractor."""
 
     platform = Platform.VIMEO
-    _bearer_token: str | None = None
+
+    # Shared across instances: {(client_id, client_secret): (token, expires_in)}
+    _token_cache = TTLCache(maxsize=4, ttl=_TOKEN_DEFAULT_TTL)
 
     async def _extract(
         self,
@@ -80,32 +138,16 @@ class VimeoExtractor(BaseExtractor):
 
         # Fetch video info from API
         api_url = f"{_VIMEO_API}/videos/{video_id}"
-        headers = {
-            "Authorization": f"Bearer {bearer}",
-            "Accept": "application/vnd.vimeo.*+json;version=3.4.10",
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
-        }
-
-        params_dict = {
-            "fields": (
-                "uri,name,description,duration,width,height,created_time,"
-                "modified_time,pictures,files,download,play,status,"
-                "user,metadata,stats,categories,tags,config_url,embed_player_config_url"
-            ),
-        }
-
+        headers = {**_API_HEADERS, "Authorization": f"Bearer {bearer}"}
         # Handle password-protected videos
-        if request.password:
-            params_dict["password"] = request.password
+        params_dict = (
+            {**_VIDEO_PARAMS, "password": request.password} if request.password else _VIDEO_PARAMS
+        )
 
         try:
             response = await self.http.get(api_url, headers=headers, params=params_dict)
             try:
-                video_data = response.json()
+                video_data = json_loads(response.content)
             except Exception:
                 video_data = {}
 
@@ -117,54 +159,43 @@ class VimeoExtractor(BaseExtractor):
                     raise ExtractionError("Could not refresh Vimeo bearer token")
                 headers["Authorization"] = f"Bearer {bearer}"
                 response = await self.http.get(api_url, headers=headers, params=params_dict)
-                video_data = response.json()
+                video_data = json_loads(response.content)
                 error_code = video_data.get("error_code") if isinstance(video_data, dict) else None
 
-            if response.status_code == 403:
-                raise ExtractionError(
-                    "Video is private or password-protected",
-                    error_code="vimeo.forbidden",
-                )
-            if response.status_code == 404 and error_code == 5460:
-                raise ExtractionError(
-                    "Login required to access this video",
-                    error_code="vimeo.login_required",
-                )
-            if response.status_code == 404:
-                raise ExtractionError(
-                    "Video not found",
-                    error_code="vimeo.not_found",
-                )
-            if response.status_code == 400:
-                invalid = traverse_obj(video_data, ("invalid_parameters",))
-                if isinstance(invalid, list) and any(
-                    "password" in (p.get("field") or "") for p in invalid if isinstance(p, dict)
-                ):
+            status = response.status_code
+            if status != 200:
+                if status == 404 and error_code == 5460:
                     raise ExtractionError(
-                        "Password required or incorrect",
-                        error_code="vimeo.password_required",
+                        "Login required to access this video",
+                        error_code="vimeo.login_required",
                     )
-            if response.status_code != 200:
-                raise ExtractionError(
-                    f"Vimeo API returned {response.status_code}",
-                    error_code="vimeo.api_error",
+                if status == 400:
+                    invalid = traverse_obj(video_data, ("invalid_parameters",))
+                    if isinstance(invalid, list) and any(
+                        "password" in (p.get("field") or "") for p in invalid if isinstance(p, dict)
+                    ):
+                        raise ExtractionError(
+                            "Password required or incorrect",
+                            error_code="vimeo.password_required",
+                        )
+                message, code = _STATUS_ERRORS.get(
+                    status, (f"Vimeo API returned {status}", "vimeo.api_error")
                 )
+                raise ExtractionError(message, error_code=code)
 
         except ExtractionError:
             raise
         except Exception as e:
             raise ExtractionError(f"Failed to fetch Vimeo video info: {e}")
 
-        return await self._parse_video(video_data, video_id, bearer)
+        return await self._parse_video(
+            video_data, video_id, bearer, all_qualities=request.all_qualities
+        )
 
     def _player_headers(self, video_id: str) -> dict:
         """Headers that mimic the Vimeo player page (Referer required for config)."""
         return {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            ),
+            "User-Agent": _USER_AGENT,
             "Referer": f"https://player.vimeo.com/video/{video_id}",
             "Origin": "https://player.vimeo.com",
         }
@@ -185,47 +216,33 @@ class VimeoExtractor(BaseExtractor):
         config_url = None
         try:
             html = await self._download_webpage(player_url, headers=page_headers)
-            config_url = self._search_regex(
-                r'data-config-url="([^"]+)"',
-                html,
-                "config_url",
-                default=None,
-            )
-            if not config_url:
-                config_url = self._search_regex(
-                    r'"config_url"\s*:\s*"([^"]+)"',
-                    html,
-                    "config_url",
-                    default=None,
-                )
+            match = _CONFIG_URL_ATTR_RE.search(html) or _CONFIG_URL_JSON_RE.search(html)
+            if match:
+                config_url = match.group(1)
         except Exception as e:
             logger.debug("Player page fetch failed, will try direct config URL: %s", e)
 
         if not config_url:
             config_url = f"https://player.vimeo.com/video/{video_id}/config"
 
-        config_url = unquote(
-            config_url.replace("\\u0026", "&").replace("\\/", "/").replace("&amp;", "&")
-        )
-
-        config = None
-        last_error = None
-        for referer in (f"https://player.vimeo.com/video/{video_id}", "https://vimeo.com/"):
-            try:
-                headers = {**config_headers, "Referer": referer}
-                config = await self._download_json(config_url, headers=headers)
-                if config and isinstance(config, dict):
-                    break
-            except Exception as e:
-                logger.debug("Config fetch with Referer %s failed: %s", referer, e)
-                last_error = e
-                config = None
+        config_url = unquote(unescape_js_url(config_url).replace("&amp;", "&"))
 
+        # Request the config with every Referer at once; the first usable one wins
+        referers = (f"https://player.vimeo.com/video/{video_id}", "https://vimeo.com/")
+        config = await self._first_result(
+            {
+                f"config with Referer {referer}": self._download_json(
+                    config_url, headers={**config_headers, "Referer": referer}
+                )
+                for referer in referers
+            },
+            accept=lambda config: config if isinstance(config, dict) else None,
+        )
         if not config:
             raise ExtractionError(
                 "Unable to extract config_url",
                 error_code="vimeo.config_missing",
-            ) from last_error
+            )
         return self._parse_player_config(config, video_id)
 
     def _parse_player_config(self, config: dict, video_id: str) -> ExtractResponse:
@@ -267,10 +284,7 @@ class VimeoExtractor(BaseExtractor):
         # Headers required for Vimeo segment requests (e.g. when using ffmpeg with HLS/DASH)
         segment_headers = {
             "Referer": f"https://player.vimeo.com/video/{video_id}",
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
-            ),
+            "User-Agent": _USER_AGENT,
         }
 
         # HLS CDNs
@@ -283,10 +297,7 @@ class VimeoExtractor(BaseExtractor):
                 FormatInfo(
                     url=hls_url,
                     format_id=f"hls_{cdn_name}",
-                    ext="mp4",
-                    protocol="hls",
-                    format_type=FormatType.COMBINED,
-                    quality_label="HLS",
+                    **_HLS_MASTER_FIELDS,
                     http_headers=segment_headers,
                 )
             )
@@ -301,9 +312,7 @@ class VimeoExtractor(BaseExtractor):
                 FormatInfo(
                     url=dash_url,
                     format_id=f"dash_{cdn_name}",
-                    ext="mpd",
-                    protocol="dash",
-                    format_type=FormatType.COMBINED,
+                    **_DASH_MANIFEST_FIELDS,
                     http_headers=segment_headers,
                 )
             )
@@ -331,56 +340,63 @@ class VimeoExtractor(BaseExtractor):
         )
 
     async def _get_bearer_token(self, force_refresh: bool = False) -> str | None:
-        """Get Vimeo OAuth bearer token using client credentials."""
-        if self._bearer_token and not force_refresh:
-            return self._bearer_token
-        if force_refresh:
-            self._bearer_token = None
-
-        # Check for cookie-based bearer
-        if self._has_cookies():
-            self._get_cookie("vuid")
-            # Cookie-based auth would use session, not bearer
-            # For now, use client credentials
-
-        # Client credentials grant (form-encoded); use env credentials if set (built-in may 401)
-        import base64
+        """
+        Get a Vimeo OAuth bearer token using client credentials.
 
+        The token is shared by all extractor instances until shortly before
+        it expires; concurrent cold starts wait on a single token request.
+        """
+        # Client credentials grant; use env credentials if set (built-in may 401)
         settings = get_settings()
         client_id = (settings.vimeo_client_id or _VIMEO_CLIENT_ID_DEFAULT).strip()
         client_secret = (settings.vimeo_client_secret or _VIMEO_CLIENT_SECRET_DEFAULT).strip()
-        auth = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
-        form_data = {
-            "grant_type": "client_credentials",
-            "scope": "private public create edit delete interact upload purchased stats video_files",
-        }
+        # Keyed by both halves so a rotated secret never reuses the old token
+        key = (client_id, client_secret)
+        if force_refresh:
+            self._token_cache.pop(key)
 
+        token, _ = await self._token_cache.get_or_load(
+            key,
+            lambda: self._fetch_bearer_token(client_id, client_secret),
+            ttl=lambda entry: entry[1] - _TOKEN_EXPIRY_MARGIN if entry[0] else 0,
+        )
+        return token or None
+
+    async def _fetch_bearer_token(self, client_id: str, client_secret: str) -> tuple[str, float]:
+        """Request a client-credentials token; returns (token, expires_in)."""
         try:
             response = await self.http.post(
                 f"{_VIMEO_API}/oauth/authorize/client",
                 headers={
-                    "Authorization": f"Basic {auth}",
-                    "Accept": "application/vnd.vimeo.*+json;version=3.4.10",
+                    "Authorization": _basic_auth_header(client_id, client_secret),
+                    "Accept": _VIMEO_ACCEPT,
                 },
-                data=form_data,
+                data=_TOKEN_FORM,
             )
 
             if response.status_code == 200:
-                data = response.json()
-                self._bearer_token = data.get("access_token")
-                return self._bearer_token
+                data = json_loads(response.content)
+                expires_in = float_or_none(data.get("expires_in")) or _TOKEN_DEFAULT_TTL
+                return data.get("access_token") or "", expires_in
         except Exception as e:
             logger.warning(f"Failed to get Vimeo bearer token: {e}")
 
-        return None
+        return "", 0
 
-    async def _parse_video(self, data: dict, video_id: str, bearer: str) -> ExtractResponse:
-        """Parse Vimeo video API response."""
+    async def _parse_video(
+        self, data: dict, video_id: str, bearer: str, all_qualities: bool = False
+    ) -> ExtractResponse:
+        """
+        Parse Vimeo video API response.
+
+        The play.hls master is only expanded into per-rendition formats when
+        the progressive MP4s fall short of the source height (or all_qualities
+        is set); otherwise it is listed as a single HLS format.
+        """
         title = data.get("name", "")
         description = data.get("description", "")
         duration = float_or_none(data.get("duration"))
-        int_or_none(data.get("width"))
-        int_or_none(data.get("height"))
+        source_height = int_or_none(data.get("height"))
 
         # Get thumbnail
         pictures = data.get("pictures", {})
@@ -404,174 +420,100 @@ class VimeoExtractor(BaseExtractor):
                     logger.debug("Could not resolve Vimeo redirect: %s", e)
             return url
 
-        # Method 1: Progressive downloads (files array) - same as Cobalt getDirectLink
-        files = data.get("files", [])
-        for f in files:
-            file_url = f.get("link") or f.get("link_secure")
-            if not file_url:
-                continue
-            file_url = await _resolve_if_redirect(file_url)
-
-            f_width = int_or_none(f.get("width"))
-            f_height = int_or_none(f.get("height"))
-            f_quality = f.get("quality", "")
-            f_type = f.get("type", "")
-            f_size = int_or_none(f.get("size"))
-
-            # Determine extension
-            ext = "mp4"
-            if "webm" in f_type:
-                ext = "webm"
-
-            formats.append(
-                FormatInfo(
-                    url=file_url,
-                    format_id=f_quality or f"file_{f_height}p",
-                    ext=ext,
-                    width=f_width,
-                    height=f_height,
-                    filesize=f_size,
-                    format_type=FormatType.COMBINED,
-                    quality_label=f_quality,
-                )
-            )
-
-        # Method 2: Download links
-        downloads = data.get("download", [])
-        for dl in downloads:
-            dl_url = dl.get("link")
-            if not dl_url:
-                continue
-            dl_url = await _resolve_if_redirect(dl_url)
-
-            dl_width = int_or_none(dl.get("width"))
-            dl_height = int_or_none(dl.get("height"))
-            dl_quality = dl.get("quality", "")
+        # Progressive MP4s: the files array and download links (same as Cobalt
+        # getDirectLink) plus play.progressive. The API returns redirect URLs;
+        # resolve them to the direct CDN like Cobalt.
+        play = data.get("play") or {}
+        progressive_entries = [
+            *(("file", f, f.get("link") or f.get("link_secure")) for f in data.get("files") or ()),
+            *(("download", dl, dl.get("link")) for dl in data.get("download") or ()),
+            *(
+                ("progressive", pg, pg.get("url") or pg.get("link"))
+                for pg in play.get("progressive") or ()
+            ),
+        ]
 
-            formats.append(
-                FormatInfo(
-                    url=dl_url,
-                    format_id=f"download_{dl_quality}",
-                    ext="mp4",
-                    width=dl_width,
-                    height=dl_height,
-                    filesize=int_or_none(dl.get("size")),
-                    format_type=FormatType.COMBINED,
-                    quality_label=dl_quality,
-                )
+        hls_url = (play.get("hls") or {}).get("link")
+        hls_task = None
+        if hls_url:
+            best_progressive = max(
+                (
+                    int_or_none(entry.get("height")) or 0
+                    for _, entry, url in progressive_entries
+                    if url
+                ),
+                default=0,
             )
+            if all_qualities or not source_height or best_progressive < source_height:
+                # Start on the HLS master now so it downloads alongside the
+                # redirect and config requests below
+                hls_task = asyncio.create_task(self._parse_hls_master(hls_url))
 
-        # Method 2b: Config URL (HLS/DASH CDNs)
+        # Player config (HLS/DASH CDNs), also fetched alongside the redirects
         config_url = data.get("config_url") or data.get("embed_player_config_url")
-        if config_url:
-            try:
-                config = await self._download_json(config_url)
-                files = traverse_obj(config, ("request", "files")) or {}
-                hls_cdns = traverse_obj(files, ("hls", "cdns")) or {}
-                for cdn_name, cdn_data in hls_cdns.items():
-                    hls_url = cdn_data.get("url")
-                    if not hls_url:
-                        continue
-                    try:
-                        hls_formats = await self._parse_hls_master(hls_url)
-                        for fmt in hls_formats:
-                            fmt.format_id = f"hls_{cdn_name}_{fmt.format_id or ''}".strip("_")
-                        formats.extend(hls_formats)
-                    except Exception:
-                        formats.append(
-                            FormatInfo(
-                                url=hls_url,
-                                format_id=f"hls_{cdn_name}",
-                                ext="mp4",
-                                protocol="hls",
-                                format_type=FormatType.COMBINED,
-                                quality_label="HLS",
-                            )
-                        )
-
-                dash_cdns = traverse_obj(files, ("dash", "cdns")) or {}
-                for cdn_name, cdn_data in dash_cdns.items():
-                    dash_url = cdn_data.get("url")
-                    if not dash_url:
-                        continue
-                    try:
-                        mpd_content = await self._download_webpage(dash_url)
-                        reps = parse_mpd(mpd_content, base_url=dash_url)
-                        for rep in reps:
-                            fmt_url = rep.url or rep.base_url
-                            if not fmt_url:
-                                continue
-                            formats.append(
-                                FormatInfo(
-                                    url=fmt_url,
-                                    format_id=f"dash_{cdn_name}_{rep.rep_id or ''}".strip("_"),
-                                    ext="mp4",
-                                    width=rep.width,
-                                    height=rep.height,
-                                    tbr=rep.bandwidth / 1000 if rep.bandwidth else None,
-                                    vcodec=rep.codecs,
-                                    format_type=FormatType.COMBINED,
-                                    protocol="dash",
-                                )
-                            )
-                    except Exception:
-                        formats.append(
-                            FormatInfo(
-                                url=dash_url,
-                                format_id=f"dash_{cdn_name}",
-                                ext="mpd",
-                                protocol="dash",
-                                format_type=FormatType.COMBINED,
-                            )
-                        )
-            except Exception as e:
-                logger.debug(f"Failed to parse Vimeo config_url: {e}")
+        config_task = (
+            asyncio.create_task(self._config_cdn_formats(config_url)) if config_url else None
+        )
 
-        # Method 3: Play (HLS/DASH)
-        play = data.get("play", {})
-        hls = play.get("hls", {})
-        hls_url = hls.get("link")
+        try:
+            # The same MP4 is often listed under several of these keys: resolve
+            # each distinct link once (concurrently), then keep the first entry
+            # for each resolved URL
+            unique_entries: dict[str, tuple[str, dict]] = {}
+            for source, entry, entry_url in progressive_entries:
+                if entry_url:
+                    unique_entries.setdefault(entry_url, (source, entry))
+            resolved_urls = await asyncio.gather(*map(_resolve_if_redirect, unique_entries))
+
+            urls_seen: set[str] = set()
+            for (source, entry), entry_url in zip(unique_entries.values(), resolved_urls):
+                if entry_url in urls_seen:
+                    continue
+                urls_seen.add(entry_url)
+
+                height = int_or_none(entry.get("height"))
+                quality = entry.get("quality") or ""
+                if source == "file":
+                    format_id = quality or f"file_{height}p"
+                elif source == "download":
+                    format_id = f"download_{quality}"
+                else:
+                    format_id = f"progressive_{height}p" if height else "progressive"
 
-        if hls_url:
-            # Parse HLS master playlist for formats
-            try:
-                hls_formats = await self._parse_hls_master(hls_url)
-                formats.extend(hls_formats)
-            except Exception as e:
-                logger.debug(f"Failed to parse Vimeo HLS: {e}")
-                # Add raw HLS as single format
                 formats.append(
                     FormatInfo(
-                        url=hls_url,
-                        format_id="hls",
-                        ext="mp4",
-                        protocol="hls",
+                        url=entry_url,
+                        format_id=format_id,
+                        ext="webm" if "webm" in (entry.get("type") or "") else "mp4",
+                        width=int_or_none(entry.get("width")),
+                        height=height,
+                        fps=float_or_none(entry.get("fps")),
+                        filesize=int_or_none(entry.get("size")),
                         format_type=FormatType.COMBINED,
-                        quality_label="HLS",
+                        quality_label=quality or None,
                     )
                 )
 
-        # Progressive play (API returns redirect URLs; resolve to direct CDN like Cobalt)
-        progressive = play.get("progressive", [])
-        for pg in progressive:
-            pg_url = pg.get("url") or pg.get("link")
-            if not pg_url:
-                continue
-
-            pg_url = await _resolve_if_redirect(pg_url)
-            pg_width = int_or_none(pg.get("width"))
-            pg_height = int_or_none(pg.get("height"))
-
+            if config_task is not None:
+                formats.extend(await config_task)
+
+            # Play HLS master (_parse_hls_master logs and returns [] on failure)
+            hls_formats = await hls_task if hls_task is not None else []
+        finally:
+            # Stop the background requests if anything above raised
+            for task in (hls_task, config_task):
+                if task is not None:
+                    task.cancel()
+
+        formats.extend(hls_formats)
+        if hls_url and not hls_formats:
+            # Raw HLS as a single format: progressive already covers the
+            # source resolution, or the master could not be parsed
             formats.append(
                 FormatInfo(
-                    url=pg_url,
-                    format_id=f"progressive_{pg_height}p" if pg_height else "progressive",
-                    ext="mp4",
-                    width=pg_width,
-                    height=pg_height,
-                    fps=float_or_none(pg.get("fps")),
-                    format_type=FormatType.COMBINED,
-                    quality_label=pg.get("quality"),
+                    url=hls_url,
+                    format_id="hls",
+                    **_HLS_MASTER_FIELDS,
                 )
             )
 
@@ -582,24 +524,21 @@ class VimeoExtractor(BaseExtractor):
             )
 
         # Build metadata
-        user = data.get("user", {})
-        stats = data.get("stats", {})
+        user = data.get("user") or {}
+        stats = data.get("stats") or {}
+        connections = (data.get("metadata") or {}).get("connections") or {}
 
         metadata = MediaMetadata(
             uploader=user.get("name"),
-            uploader_id=str_or_none(traverse_obj(user, ("uri",))),
+            uploader_id=str_or_none(user.get("uri")),
             uploader_url=user.get("link"),
             description=description,
             upload_date=format_date(data.get("created_time")),
             view_count=int_or_none(stats.get("plays")),
-            like_count=int_or_none(
-                traverse_obj(data, ("metadata", "connections", "likes", "total"))
-            ),
-            comment_count=int_or_none(
-                traverse_obj(data, ("metadata", "connections", "comments", "total"))
-            ),
-            tags=[t.get("name") for t in (data.get("tags") or []) if t.get("name")],
-            categories=[c.get("name") for c in (data.get("categories") or []) if c.get("name")],
+            like_count=int_or_none((connections.get("likes") or {}).get("total")),
+            comment_count=int_or_none((connections.get("comments") or {}).get("total")),
+            tags=[name for t in data.get("tags") or () if (name := t.get("name"))],
+            categories=[name for c in data.get("categories") or () if (name := c.get("name"))],
         )
 
         return ExtractResponse(
@@ -612,53 +551,93 @@ class VimeoExtractor(BaseExtractor):
             metadata=metadata,
         )
 
+    async def _config_cdn_formats(self, config_url: str) -> list[FormatInfo]:
+        """Formats for every HLS/DASH CDN in a player config, expanded concurrently."""
+        try:
+            config = await self._download_json(config_url)
+            files = traverse_obj(config, ("request", "files")) or {}
+            hls_cdns = traverse_obj(files, ("hls", "cdns")) or {}
+            dash_cdns = traverse_obj(files, ("dash", "cdns")) or {}
+            groups = await asyncio.gather(
+                *(
+                    self._hls_cdn_formats(cdn_name, cdn_data["url"])
+                    for cdn_name, cdn_data in hls_cdns.items()
+                    if cdn_data.get("url")
+                ),
+                *(
+                    self._dash_cdn_formats(cdn_name, cdn_data["url"])
+                    for cdn_name, cdn_data in dash_cdns.items()
+                    if cdn_data.get("url")
+                ),
+            )
+        except Exception as e:
+            logger.debug(f"Failed to parse Vimeo config_url: {e}")
+            return []
+        return [fmt for group in groups for fmt in group]
+
+    async def _hls_cdn_formats(self, cdn_name: str, hls_url: str) -> list[FormatInfo]:
+        """Expand one CDN's HLS master, or list it as a single format if that fails."""
+        hls_formats = await self._parse_hls_master(hls_url)
+        for fmt in hls_formats:
+            fmt.format_id = f"hls_{cdn_name}_{fmt.format_id or ''}".strip("_")
+        return hls_formats or [
+            FormatInfo(url=hls_url, format_id=f"hls_{cdn_name}", **_HLS_MASTER_FIELDS)
+        ]
+
+    async def _dash_cdn_formats(self, cdn_name: str, dash_url: str) -> list[FormatInfo]:
+        """Expand one CDN's DASH manifest, or list it as a single format if that fails."""
+        try:
+            mpd_content = await self._download_webpage(dash_url)
+            reps = parse_mpd(mpd_content, base_url=dash_url)
+        except Exception as e:
+            logger.debug(f"Failed to parse Vimeo DASH manifest: {e}")
+            return [FormatInfo(url=dash_url, format_id=f"dash_{cdn_name}", **_DASH_MANIFEST_FIELDS)]
+        return [
+            FormatInfo(
+                url=fmt_url,
+                format_id=f"dash_{cdn_name}_{rep.rep_id or ''}".strip("_"),
+                ext="mp4",
+                width=rep.width,
+                height=rep.height,
+                tbr=rep.bandwidth / 1000 if rep.bandwidth else None,
+                vcodec=rep.codecs,
+                format_type=FormatType.COMBINED,
+                protocol="dash",
+            )
+            for rep in reps
+            if (fmt_url := rep.url or rep.base_url)
+        ]
+
     async def _parse_hls_master(self, hls_url: str) -> list[FormatInfo]:
         """Parse an HLS master playlist into individual format entries."""
         formats = []
 
         try:
             content = await self._download_webpage(hls_url)
+            base = hls_url.rsplit("/", 1)[0]
 
-            lines = content.strip().split("\n")
-            i = 0
-            while i < len(lines):
-                line = lines[i].strip()
-                if line.startswith("#EXT-X-STREAM-INF:"):
-                    attrs = parse_m3u8_attributes(line.split(":", 1)[1])
-                    # Next line is the URL
-                    if i + 1 < len(lines):
-                        stream_url = lines[i + 1].strip()
-                        if not stream_url.startswith("http"):
-                            # Relative URL
-                            base = hls_url.rsplit("/", 1)[0]
-                            stream_url = f"{base}/{stream_url}"
-
-                        bandwidth = int_or_none(attrs.get("BANDWIDTH"))
-                        resolution = attrs.get("RESOLUTION", "")
-                        attrs.get("CODECS", "")
-
-                        width = None
-                        height = None
-                        if "x" in resolution:
-                            parts = resolution.split("x")
-                            width = int_or_none(parts[0])
-                            height = int_or_none(parts[1])
-
-                        formats.append(
-                            FormatInfo(
-                                url=stream_url,
-                                format_id=f"hls_{height}p" if height else "hls",
-                                ext="mp4",
-                                width=width,
-                                height=height,
-                                tbr=float_or_none(bandwidth, scale=1000),
-                                protocol="hls",
-                                format_type=FormatType.COMBINED,
-                                quality_label=f"{height}p" if height else None,
-                            )
-                        )
-                        i += 1
-                i += 1
+            for match in _STREAM_INF_RE.finditer(content):
+                attrs = parse_m3u8_attributes(match.group(1))
+                stream_url = match.group(2).strip()
+                if not stream_url.startswith("http"):
+                    # Relative URL
+                    stream_url = f"{base}/{stream_url}"
+
+                w, _, h = attrs.get("RESOLUTION", "").partition("x")
+                width = int_or_none(w) if h else None
+                height = int_or_none(h)
+
+                formats.append(
+                    FormatInfo(
+                        url=stream_url,
+                        format_id=f"hls_{height}p" if height else "hls",
+                        width=width,
+                        height=height,
+                        tbr=float_or_none(attrs.get("BANDWIDTH"), scale=1000),
+                        quality_label=f"{height}p" if height else None,
+                        **_HLS_FIELDS,
+                    )
+                )
         except Exception as e:
             logger.debug(f"HLS parsing failed: {e}")
 
@@ -6,6 +6,7 @@ YouTube, Instagram, Twitter/X, TikTok, Facebook, Reddit, SoundCloud,
 Vimeo, Twitch, Google Drive, Pinterest and Snapchat.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -47,10 +48,24 @@ async def lifespan(app: FastAPI):
     get_cookie_manager()
     logger.info("Cookie manager initialized")
 
+    # Open HTTP/2 connections to hot platform hosts in the background
+    prewarm_task = None
+    if settings.prewarm_connections:
+        from .extractors import prewarm_extractor_connections
+
+        prewarm_task = asyncio.create_task(prewarm_extractor_connections())
+
     yield
 
     logger.info("Media Fetch API shutting down...")
 
+    if prewarm_task and not prewarm_task.done():
+        prewarm_task.cancel()
+
+    from .core.http_client import close_shared_transport
+
+    await close_shared_transport()
+
 
 app = FastAPI(
     title="Media Fetch API",
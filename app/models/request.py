@@ -50,3 +50,18 @@ class ExtractRequest(BaseModel):
         max_length=512,
         description="Password for password-protected content (e.g., Vimeo)",
     )
+    all_qualities: bool = Field(
+        default=False,
+        description=(
+            "Return every image rendition instead of only the largest (e.g., Pinterest), "
+            "and expand Vimeo HLS renditions even when progressive MP4s already reach "
+            "the source resolution."
+        ),
+    )
+    include_sizes: bool = Field(
+        default=False,
+        description=(
+            "Fill in filesize with a HEAD request per direct media URL (e.g., Twitch clips). "
+            "Adds a round trip; streaming formats are never probed."
+        ),
+    )
@@ -102,7 +102,9 @@ async def extract_media(request: ExtractRequest):
             request=request,
             params=match_result.params,
         )
-        return response
+        # Serialize straight from the model: a plain return would make FastAPI
+        # dump, re-validate and re-encode the already-validated response.
+        return Response(content=response.model_dump_json(), media_type="application/json")
     except ExtractionError as e:
         raise HTTPException(
             status_code=500,
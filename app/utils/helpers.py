@@ -3,6 +3,7 @@ General utility functions used across extractors.
 Ported from yt-dlp's utils.py and cobalt's misc/ helpers.
 """
 
+import functools
 import html
 import json
 import re
@@ -10,13 +11,56 @@ from datetime import datetime
 from typing import Any
 from urllib.parse import unquote
 
+try:
+    import orjson
+except ImportError:  # optional "fast" extra
+    orjson = None
 
+
+def json_loads(data: str | bytes) -> Any:
+    """
+    Parse JSON, using orjson when installed and the stdlib otherwise.
+
+    Input orjson rejects but the stdlib accepts (NaN, lone surrogate
+    escapes) still parses via the fallback; bad input raises
+    json.JSONDecodeError either way.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+
+@functools.lru_cache(maxsize=1024)
 def clean_html(raw_html: str) -> str:
     """Remove HTML tags and decode entities."""
-    clean = re.sub(r"<[^>]+>", "", raw_html)
+    # Most titles/descriptions are plain text; skip the regex and unescape
+    if "<" not in raw_html and "&" not in raw_html:
+        return raw_html.strip()
+    clean = _HTML_TAG_RE.sub("", raw_html)
     return html.unescape(clean).strip()
 
 
+_JS_URL_ESCAPE_RE = re.compile(r"\\u([0-9a-fA-F]{4})|\\/")
+
+
+def _js_url_escape_sub(m: re.Match[str]) -> str:
+    code = m.group(1)
+    return chr(int(code, 16)) if code else "/"
+
+
+def unescape_js_url(url: str) -> str:
+    """Undo JSON string escaping (\\/ and \\uXXXX) in a URL scraped from HTML, in one pass."""
+    if "\\" not in url:
+        return url
+    return _JS_URL_ESCAPE_RE.sub(_js_url_escape_sub, url)
+
+
 def extract_json_from_html(html_text: str, variable_name: str) -> dict | None:
     """
     Extract a JSON object assigned to a JavaScript variable in HTML.
@@ -32,7 +76,7 @@ def extract_json_from_html(html_text: str, variable_name: str) -> dict | None:
         match = re.search(pattern, html_text, re.DOTALL)
         if match:
             try:
-                return json.loads(match.group(1))
+                return json_loads(match.group(1))
             except json.JSONDecodeError:
                 continue
 
@@ -45,12 +89,46 @@ def extract_json_from_script(html_text: str, script_id: str) -> dict | None:
     match = re.search(pattern, html_text, re.DOTALL)
     if match:
         try:
-            return json.loads(match.group(1))
+            return json_loads(match.group(1))
         except json.JSONDecodeError:
             return None
     return None
 
 
+_JSON_DECODER = json.JSONDecoder()
+
+
+@functools.lru_cache(maxsize=32)
+def _json_any_pattern(names: tuple[str, ...]) -> re.Pattern[str]:
+    alts = "|".join(re.escape(name) for name in names)
+    return re.compile(
+        rf"""<script[^>]*\bid=["']?(?:{alts})["']?[^>]*>|\b(?:{alts})\s*=\s*(?=[{{\[])"""
+    )
+
+
+def extract_json_any(html_text: str, names: tuple[str, ...]) -> dict | list | None:
+    """
+    Extract the first JSON payload published under any of the given names,
+    either as a <script id=NAME> body or a NAME = {...} assignment.
+
+    One scan covers every name and both forms, where the
+    extract_json_from_html/extract_json_from_script pair needs one per
+    name and form. The first match in the document wins.
+    """
+    for match in _json_any_pattern(names).finditer(html_text):
+        start = match.end()
+        try:
+            if match.group().startswith("<"):
+                end = html_text.find("</script>", start)
+                if end != -1:
+                    return json_loads(html_text[start:end])
+            else:
+                return _JSON_DECODER.raw_decode(html_text, start)[0]
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
 def traverse_obj(obj: Any, *paths: Any, default: Any = None) -> Any:
     """
     Traverse nested dicts/lists safely.
@@ -300,12 +378,13 @@ def decode_base64_url(s: str) -> str:
     return base64.b64decode(s).decode("utf-8", errors="replace")
 
 
+# Match KEY=VALUE or KEY="VALUE"
+_M3U8_ATTR_RE = re.compile(r'(?:^|,)([A-Z0-9-]+)=(?:"([^"]*?)"|([^,]*))')
+
+
 def parse_m3u8_attributes(line: str) -> dict[str, str]:
     """Parse M3U8 attribute list (key=value pairs)."""
     attrs = {}
-    # Match KEY=VALUE or KEY="VALUE"
-    for match in re.finditer(r'(?:^|,)([A-Z0-9-]+)=(?:"([^"]*?)"|([^,]*))', line):
-        key = match.group(1)
-        value = match.group(2) if match.group(2) is not None else match.group(3)
-        attrs[key] = value
+    for key, quoted, bare in _M3U8_ATTR_RE.findall(line):
+        attrs[key] = quoted if quoted else bare
     return attrs
@@ -0,0 +1,112 @@
+"""Tests for the in-memory TTL cache."""
+
+import asyncio
+
+import pytest
+
+from app.core.cache import TTLCache
+
+
+class TestTTLCache:
+    def test_set_and_get(self):
+        cache = TTLCache(maxsize=4, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert "a" in cache
+        assert cache.get("missing", "d") == "d"
+
+    def test_expired_entry_is_dropped(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+        cache = TTLCache(maxsize=4, ttl=10)
+        cache.set("a", 1)
+        now[0] += 11
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_per_entry_ttl(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+        cache = TTLCache(maxsize=4, ttl=100)
+        cache.set("short", 1, ttl=5)
+        cache.set("long", 2)
+        now[0] += 6
+        assert "short" not in cache
+        assert cache.get("long") == 2
+
+    def test_non_positive_ttl_skips(self):
+        cache = TTLCache(maxsize=4, ttl=0)
+        cache.set("a", 1)
+        assert "a" not in cache
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # a is now most recently used
+        cache.set("c", 3)
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+    def test_pop(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        assert cache.pop("a") == 1
+        assert cache.pop("a", "gone") == "gone"
+
+
+class TestGetOrLoad:
+    async def test_caches_result(self):
+        cache = TTLCache(maxsize=4, ttl=60)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            return "value"
+
+        assert await cache.get_or_load("k", loader) == "value"
+        assert await cache.get_or_load("k", loader) == "value"
+        assert calls == 1
+
+    async def test_coalesces_concurrent_misses(self):
+        cache = TTLCache(maxsize=4, ttl=60)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(5)))
+        assert results == [1] * 5
+        assert calls == 1
+
+    async def test_errors_are_not_cached(self):
+        cache = TTLCache(maxsize=4, ttl=60)
+
+        async def failing():
+            raise ValueError("boom")
+
+        async def ok():
+            return "ok"
+
+        with pytest.raises(ValueError):
+            await cache.get_or_load("k", failing)
+        assert await cache.get_or_load("k", ok) == "ok"
+
+    async def test_ttl_from_loaded_value(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+        cache = TTLCache(maxsize=4, ttl=60)
+
+        async def loader():
+            return ("token", 10)
+
+        await cache.get_or_load("k", loader, ttl=lambda v: v[1])
+        now[0] += 5
+        assert cache.get("k") == ("token", 10)
+        now[0] += 6
+        assert "k" not in cache
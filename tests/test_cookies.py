@@ -155,3 +155,17 @@ class TestIgnoresUnknownServices:
             "google_drive",
         }
         assert expected == COOKIE_SERVICES
+
+
+class TestGeneration:
+    def test_changes_on_mutation(self, tmp_cookie_dir):
+        cm = CookieManager(cookie_dir=tmp_cookie_dir)
+        gen = cm.generation
+        cm.set_cookies("instagram", {"sessionid": "abc"})
+        assert cm.generation != gen
+        gen = cm.generation
+        cm.clear_cookies("instagram")
+        assert cm.generation != gen
+        gen = cm.generation
+        cm.reload()
+        assert cm.generation != gen
@@ -1,8 +1,10 @@
 """Tests for extractor loading and base class behaviour."""
 
+import pytest
+
 from app.extractors import ExtractionError, get_extractor
 from app.extractors.base import BaseExtractor
-from app.models.enums import Platform
+from app.models.enums import FormatType, Platform
 
 
 class TestExtractorFactory:
@@ -41,3 +43,1043 @@ class TestExtractionError:
     def test_with_code(self):
         err = ExtractionError("nope", error_code="youtube.cipher_fail")
         assert err.error_code == "youtube.cipher_fail"
+
+
+class TestProbeFilesizes:
+    async def test_heads_direct_urls_only(self, monkeypatch):
+        import httpx
+
+        from app.models.response import FormatInfo
+
+        ext = get_extractor(Platform.TWITCH)
+        probed = []
+
+        async def fake_head(url, **kwargs):
+            probed.append(url)
+            if url.endswith("broken"):
+                raise httpx.ConnectError("boom")
+            return httpx.Response(200, headers={"content-length": "1234"})
+
+        monkeypatch.setattr(ext.http, "head", fake_head)
+        formats = [
+            FormatInfo(url="https://v/a.mp4"),
+            FormatInfo(url="https://v/broken"),
+            FormatInfo(url="https://v/b.m3u8", protocol="hls"),
+            FormatInfo(url="https://v/c.mp4", filesize=1),
+        ]
+        await ext._probe_filesizes(formats)
+        assert sorted(probed) == ["https://v/a.mp4", "https://v/broken"]
+        assert [f.filesize for f in formats] == [1234, None, None, 1]
+
+
+class TestFirstResult:
+    async def test_first_accepted_result_wins_and_rest_cancelled(self):
+        import asyncio
+
+        ext = get_extractor(Platform.TWITCH)
+        cancelled = []
+
+        async def job(label):
+            if label == "broken":
+                raise RuntimeError("404")
+            if label == "empty":
+                return None
+            if label == "rejected":
+                return "no"
+            if label == "hit":
+                await asyncio.sleep(0.01)
+                return "yes"
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(label)
+                raise
+
+        labels = ["broken", "empty", "rejected", "hit", "slow"]
+        result = await ext._first_result(
+            {label: job(label) for label in labels},
+            accept=lambda value: value.upper() if value == "yes" else None,
+        )
+        await asyncio.sleep(0)
+        assert result == "YES"
+        assert cancelled == ["slow"]
+
+    async def test_none_when_nothing_accepted(self):
+        ext = get_extractor(Platform.TWITCH)
+
+        async def job(value):
+            return value
+
+        assert await ext._first_result({"a": job(None), "b": job({})}) is None
+
+
+class TestResponseCache:
+    async def test_params_are_part_of_the_key(self, monkeypatch):
+        from app.core.url_matcher import match_url
+        from app.extractors.soundcloud import SoundCloudExtractor
+        from app.models.request import ExtractRequest
+        from app.models.response import ExtractResponse
+
+        monkeypatch.setattr("app.extractors.base._response_cache", None)
+        calls = []
+
+        async def fake_extract(self, media_id, url, request, params):
+            calls.append(params["user"])
+            return ExtractResponse(platform=Platform.SOUNDCLOUD, id=media_id, title=params["user"])
+
+        monkeypatch.setattr(SoundCloudExtractor, "_extract", fake_extract)
+        titles = []
+        for url in ("https://soundcloud.com/alice/intro", "https://soundcloud.com/bob/intro"):
+            match = match_url(url)
+            request = ExtractRequest(url=url)
+            response = await get_extractor(Platform.SOUNDCLOUD).extract(
+                match.media_id, url, request, match.params
+            )
+            titles.append(response.title)
+        assert titles == calls == ["alice", "bob"]
+
+    def test_soundcloud_slug_without_user_is_not_cached(self):
+        from app.models.request import ExtractRequest
+
+        ext = get_extractor(Platform.SOUNDCLOUD)
+        request = ExtractRequest(url="https://soundcloud.com/alice/intro")
+        assert ext._response_cache_key("intro", "intro", request, {}) is None
+        assert ext._response_cache_key("intro", request.url, request, {"user": "alice"})
+        assert ext._response_cache_key("Ab1", "https://on.soundcloud.com/Ab1", request, {})
+
+
+class TestShortLinks:
+    @staticmethod
+    def _response(status, url):
+        import httpx
+
+        return httpx.Response(status, request=httpx.Request("GET", url))
+
+    async def test_resolves_via_head(self, monkeypatch):
+        from app.extractors.reddit import _COMMENTS_ID_RE
+
+        ext = get_extractor(Platform.REDDIT)
+        final = "https://www.reddit.com/r/a/comments/abc/x/"
+
+        async def fake_head(url, **kwargs):
+            return self._response(200, final)
+
+        monkeypatch.setattr(ext.http, "head", fake_head)
+        assert await ext._resolve_short_link("https://redd.it/abc", _COMMENTS_ID_RE) == final
+
+    @pytest.mark.parametrize(
+        "status,final",
+        [
+            (429, "https://redd.it/abc"),
+            (200, "https://www.reddit.com/login/?dest=x"),
+        ],
+    )
+    async def test_failures_raise_and_are_not_cached(self, monkeypatch, status, final):
+        from app.core.cache import TTLCache
+        from app.extractors.reddit import _COMMENTS_ID_RE, RedditExtractor
+
+        monkeypatch.setattr(RedditExtractor, "_redirect_cache", TTLCache(maxsize=4))
+        ext = get_extractor(Platform.REDDIT)
+        fetched = []
+
+        async def fake_request(url, **kwargs):
+            return self._response(status, final)
+
+        async def fake_fetch(post_id, url):
+            fetched.append(post_id)
+            return None
+
+        monkeypatch.setattr(ext.http, "head", fake_request)
+        monkeypatch.setattr(ext.http, "get", fake_request)
+        monkeypatch.setattr(ext, "_fetch_post_data", fake_fetch)
+        with pytest.raises(ExtractionError):
+            await ext._resolve_short_link("https://redd.it/abc", _COMMENTS_ID_RE)
+        with pytest.raises(ExtractionError):
+            await ext._extract("abc", "https://redd.it/abc", None, {})
+        assert fetched == ["abc"]
+        assert len(RedditExtractor._redirect_cache) == 0
+
+    @pytest.mark.parametrize(
+        "platform,final,ok",
+        [
+            (Platform.TIKTOK, "https://www.tiktok.com/@a/video/123?is_from_webapp=1", True),
+            (Platform.TIKTOK, "https://www.tiktok.com/login?redirect=x", False),
+            (Platform.SOUNDCLOUD, "https://soundcloud.com/alice/intro?si=x", True),
+            (Platform.SOUNDCLOUD, "https://on.soundcloud.com/Ab1", False),
+        ],
+    )
+    async def test_expected_patterns(self, monkeypatch, platform, final, ok):
+        from app.extractors.soundcloud import _SC_TRACK_URL_RE
+        from app.extractors.tiktok import _TT_VIDEO_ID_RE
+
+        expected = _TT_VIDEO_ID_RE if platform == Platform.TIKTOK else _SC_TRACK_URL_RE
+        ext = get_extractor(platform)
+
+        async def fake_request(url, **kwargs):
+            return self._response(200, final)
+
+        monkeypatch.setattr(ext.http, "head", fake_request)
+        monkeypatch.setattr(ext.http, "get", fake_request)
+        if ok:
+            assert await ext._resolve_short_link("https://short/x", expected) == final
+        else:
+            with pytest.raises(ExtractionError):
+                await ext._resolve_short_link("https://short/x", expected)
+
+
+class TestDownloadWebpageUntil:
+    @staticmethod
+    def _serve(ext, chunks, sent):
+        import httpx
+
+        async def body():
+            for chunk in chunks:
+                sent.append(chunk)
+                yield chunk.encode()
+
+        def handler(request):
+            return httpx.Response(200, content=body())
+
+        ext.http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def test_stops_after_patterns_match_in_order(self):
+        import re
+
+        ext = get_extractor(Platform.INSTAGRAM)
+        sent = []
+        chunks = ["<script>x</script>", '{"video_url":"https://v/', 'a.mp4"}', "</script>", "tail"]
+        self._serve(ext, chunks, sent)
+        text = await ext._download_webpage_until(
+            "https://e/", re.compile(r'"video_url":"([^"]+)"'), re.compile(r"</script>")
+        )
+        # The first </script> precedes video_url, so it does not end the read
+        assert text == "".join(chunks[:4])
+        assert "tail" not in sent
+
+    async def test_reading_is_capped(self):
+        import re
+
+        ext = get_extractor(Platform.INSTAGRAM)
+        sent = []
+        self._serve(ext, ["a" * 10] * 5, sent)
+        text = await ext._download_webpage_until("https://e/", re.compile("b"), max_chars=25)
+        assert len(text) == 30
+        assert len(sent) == 3
+
+
+class TestInstagramShortcode:
+    def test_single_char(self):
+        from app.extractors.instagram import _shortcode_to_media_id
+
+        assert _shortcode_to_media_id("A") == "0"
+        assert _shortcode_to_media_id("_") == "63"
+
+    def test_multi_char(self):
+        from app.extractors.instagram import _shortcode_to_media_id
+
+        # "BA" = 1 * 64 + 0
+        assert _shortcode_to_media_id("BA") == "64"
+        assert _shortcode_to_media_id("CuV8_r4LYp0") == "3140684574391896692"
+
+    def test_invalid_char_rejected(self):
+        from app.extractors.instagram import _shortcode_to_media_id
+
+        with pytest.raises(ValueError):
+            _shortcode_to_media_id("abc!")
+        with pytest.raises(ValueError):
+            _shortcode_to_media_id("abcé")
+
+
+class TestInstagramParse:
+    def test_candidates_deduped_largest_first(self):
+        from app.extractors.instagram import _candidates_to_formats
+
+        fmts = _candidates_to_formats(
+            [
+                {"url": "https://cdn/s.jpg", "width": 320, "height": 320},
+                {"url": "https://cdn/l.jpg", "width": 1080, "height": 1080},
+                {"url": "https://cdn/s.jpg", "width": 320, "height": 320},
+                {"url": None},
+            ],
+            "jpg",
+        )
+        assert [f.url for f in fmts] == ["https://cdn/l.jpg", "https://cdn/s.jpg"]
+        assert fmts[0].ext == "jpg"
+
+    def test_media_item_missing_nested_fields(self):
+        ext = get_extractor(Platform.INSTAGRAM)
+        resp = ext._parse_media_item(
+            {
+                "media_type": 1,
+                "user": None,
+                "caption": None,
+                "image_versions2": {
+                    "candidates": [{"url": "https://cdn/p.jpg", "width": 640, "height": 640}]
+                },
+            },
+            "123",
+        )
+        assert resp.title == "Instagram Post"
+        assert resp.thumbnail == "https://cdn/p.jpg"
+        assert resp.metadata.uploader is None
+        assert resp.metadata.uploader_id is None
+        assert [f.url for f in resp.formats] == ["https://cdn/p.jpg"]
+
+    def test_media_item_user_and_caption(self):
+        ext = get_extractor(Platform.INSTAGRAM)
+        resp = ext._parse_media_item(
+            {
+                "media_type": 2,
+                "user": {"username": "nasa", "pk": 528817151},
+                "caption": {"text": "Liftoff"},
+                "video_versions": [{"url": "https://cdn/v.mp4", "width": 720, "height": 1280}],
+            },
+            "123",
+        )
+        assert resp.title == "@nasa: Liftoff"
+        assert resp.thumbnail is None
+        assert resp.metadata.uploader_id == "528817151"
+
+    def test_media_item_carousel(self):
+        ext = get_extractor(Platform.INSTAGRAM)
+        resp = ext._parse_media_item(
+            {
+                "media_type": 8,
+                "carousel_media": [
+                    {
+                        "media_type": 1,
+                        "image_versions2": {
+                            "candidates": [
+                                {"url": "https://cdn/s.jpg", "width": 320, "height": 320},
+                                {"url": "https://cdn/l.jpg", "width": 1080, "height": 1080},
+                            ]
+                        },
+                    },
+                    {"media_type": 2, "video_versions": [{"url": "https://cdn/v.mp4"}]},
+                ],
+            },
+            "123",
+        )
+        assert [(f.format_id, f.url) for f in resp.formats] == [
+            ("carousel_0_img", "https://cdn/l.jpg"),
+            ("carousel_1", "https://cdn/v.mp4"),
+        ]
+        assert resp.duration is None
+
+
+class TestPinterestParse:
+    _IMAGES = {
+        "236x": {"url": "https://i.pinimg.com/236x/a.jpg", "width": 236, "height": 300},
+        "orig": {"url": "https://i.pinimg.com/originals/a.jpg", "width": 1000, "height": 1270},
+        "736x": {"url": "https://i.pinimg.com/736x/a.jpg", "width": 736, "height": 935},
+    }
+
+    def test_image_pin_best_only_by_default(self):
+        ext = get_extractor(Platform.PINTEREST)
+        resp = ext._parse_pin({"images": self._IMAGES}, "1")
+        assert [f.format_id for f in resp.formats] == ["orig"]
+
+    def test_image_pin_all_sizes_on_request(self):
+        ext = get_extractor(Platform.PINTEREST)
+        resp = ext._parse_pin({"images": self._IMAGES}, "1", all_images=True)
+        assert [f.format_id for f in resp.formats] == ["orig", "736x", "236x"]
+
+    def test_video_pin_ordered_with_duration(self):
+        ext = get_extractor(Platform.PINTEREST)
+        video_list = {
+            "V_HLSV3_MOBILE": {"url": "https://v1.pinimg.com/m.m3u8", "duration": 12500},
+            "V_720P": {"url": "https://v1.pinimg.com/720.mp4", "duration": 12500},
+        }
+        resp = ext._parse_pin({"videos": {"video_list": video_list}}, "1")
+        assert [f.format_id for f in resp.formats] == ["V_720P", "V_HLSV3_MOBILE"]
+        assert resp.duration == 12.5
+
+
+class TestRedditEndpointOrder:
+    def test_failing_endpoint_is_skipped_then_retried(self, monkeypatch):
+        from app.extractors.reddit import RedditExtractor
+
+        now = [1000.0]
+        monkeypatch.setattr("app.extractors.reddit.time.monotonic", lambda: now[0])
+        monkeypatch.setattr(RedditExtractor, "_endpoint_stats", {})
+        ext = get_extractor(Platform.REDDIT)
+        assert ext._endpoint_order() == ["old", "www", "oauth"]
+
+        for _ in range(3):
+            ext._record_endpoint("old", False)
+        assert ext._endpoint_order() == ["www", "oauth"]
+
+        now[0] += 301
+        assert ext._endpoint_order() == ["www", "oauth", "old"]
+
+        ext._record_endpoint("old", True)
+        assert ext._endpoint_order() == ["old", "www", "oauth"]
+
+    async def test_race_records_each_endpoint(self, monkeypatch):
+        import httpx
+
+        from app.extractors.reddit import RedditExtractor
+
+        monkeypatch.setattr(RedditExtractor, "_endpoint_stats", {})
+        ext = get_extractor(Platform.REDDIT)
+
+        async def fake_get(url, headers=None):
+            if url.startswith("https://old."):
+                raise httpx.ConnectError("boom")
+            return httpx.Response(200, json=[{"post": "www"}])
+
+        monkeypatch.setattr(ext.http, "get", fake_get)
+        data = await ext._race_endpoints(["old", "www"], "abc")
+        assert data == {"post": "www"}
+        assert ext._endpoint_stats["old"]["fail"] == 1
+        assert ext._endpoint_stats["www"]["ok"] == 1
+
+    @pytest.mark.parametrize(
+        ("status", "order"), [(404, ["old", "www", "oauth"]), (503, ["oauth"])]
+    )
+    async def test_only_host_errors_trip_endpoints(self, monkeypatch, status, order):
+        import httpx
+
+        from app.extractors.reddit import _ENDPOINT_FAIL_THRESHOLD, RedditExtractor
+
+        monkeypatch.setattr(RedditExtractor, "_endpoint_stats", {})
+        ext = get_extractor(Platform.REDDIT)
+
+        async def fake_get(url, headers=None):
+            return httpx.Response(status)
+
+        monkeypatch.setattr(ext.http, "get", fake_get)
+        for _ in range(_ENDPOINT_FAIL_THRESHOLD):
+            assert (
+                await ext._fetch_post_data("gone", "https://www.reddit.com/comments/gone") is None
+            )
+        assert ext._endpoint_order() == order
+
+    @pytest.mark.parametrize(
+        ("statuses", "expect_oauth"),
+        [
+            ({"old": 403, "www": 401}, True),
+            ({"old": 403, "www": 404}, False),
+            ({"old": 403}, True),
+            ({}, False),
+        ],
+    )
+    async def test_oauth_only_after_auth_errors(self, monkeypatch, statuses, expect_oauth):
+        from app.extractors.reddit import RedditExtractor
+
+        monkeypatch.setattr(RedditExtractor, "_endpoint_stats", {})
+        ext = get_extractor(Platform.REDDIT)
+        called = []
+
+        async def fake_fetch(name, post_id):
+            called.append(name)
+            if name == "oauth":
+                return {"post": name}
+            if name in statuses:
+                ext._endpoint_status[name] = statuses[name]
+            return None
+
+        monkeypatch.setattr(ext, "_fetch_endpoint", fake_fetch)
+        data = await ext._fetch_post_data("abc", "https://www.reddit.com/comments/abc")
+        assert ("oauth" in called) is expect_oauth
+        assert data == ({"post": "oauth"} if expect_oauth else None)
+
+
+class TestSnapchatSpotlightScan:
+    def test_first_occurrence_of_each_field(self):
+        from app.extractors.snapchat import _scan_spotlight_fields
+
+        html = (
+            "<html><head><title>Cool snap</title>"
+            '<meta property="og:image" content="https://cf/og.jpg">'
+            '<link rel="preload" href="https://cf/v.mp4?a=1&amp;b=2" as="video">'
+            '</head><script>{"description":"first","contentUrl":"https://cf/c.mp4",'
+            '"description":"second"}</script></html>'
+        )
+        fields = _scan_spotlight_fields(html)
+        assert fields["title"] == "Cool snap"
+        assert fields["preload"] == "https://cf/v.mp4?a=1&amp;b=2"
+        assert fields["content_url"] == "https://cf/c.mp4"
+        assert fields["og_image"] == "https://cf/og.jpg"
+        assert fields["description"] == "first"
+        assert "thumbnail" not in fields
+
+
+class TestRedditParsePost:
+    @staticmethod
+    def _post(height):
+        return {
+            "data": {
+                "children": [
+                    {
+                        "data": {
+                            "title": "clip",
+                            "author": "someone",
+                            "media": {
+                                "reddit_video": {
+                                    "fallback_url": f"https://v.redd.it/abc/DASH_{height}.mp4?source=fallback",
+                                    "height": height,
+                                    "width": height * 16 // 9,
+                                    "duration": 12,
+                                }
+                            },
+                        }
+                    }
+                ]
+            }
+        }
+
+    def _video_ids(self, resp):
+        return [f.format_id for f in resp.formats if f.format_type.value == "video_only"]
+
+    def test_variants_below_source_height(self):
+        ext = get_extractor(Platform.REDDIT)
+        resp = ext._parse_post(self._post(720), "abc")
+        assert self._video_ids(resp) == ["video_720p", "video_480p", "video_360p", "video_240p"]
+        assert [f.url for f in resp.formats if f.format_id == "audio"] == [
+            "https://v.redd.it/abc/DASH_AUDIO_128.mp4"
+        ]
+
+    def test_variants_capped_by_requested_quality(self):
+        ext = get_extractor(Platform.REDDIT)
+        resp = ext._parse_post(self._post(1080), "abc", max_height=360)
+        assert self._video_ids(resp) == ["video_1080p", "video_360p", "video_240p"]
+
+
+class TestTikTokPageData:
+    @pytest.mark.parametrize(
+        "page",
+        [
+            '<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">'
+            '{"ok": "\u00e9"}</script>',
+            '<script>window.SIGI_STATE = {"ok": "\u00e9"};</script>',
+        ],
+    )
+    async def test_fetch_page_data(self, monkeypatch, page):
+        import httpx
+
+        ext = get_extractor(Platform.TIKTOK)
+
+        async def fake_get(url, headers=None):
+            return httpx.Response(200, content=page.encode())
+
+        monkeypatch.setattr(ext.http, "get", fake_get)
+        assert await ext._fetch_page_data("https://www.tiktok.com/@i/video/1", {}) == {"ok": "é"}
+
+
+class TestTikTokParse:
+    def test_find_rehydration_script(self):
+        from app.extractors.tiktok import _find_rehydration_script
+
+        page = b'<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="a">{"x":1}</script>'
+        assert _find_rehydration_script(page) == b'{"x":1}'
+        assert _find_rehydration_script(page[:-9]) is None
+        assert _find_rehydration_script(b"<html></html>") is None
+
+    def test_bitrate_variants_and_download_dedupe(self):
+        ext = get_extractor(Platform.TIKTOK)
+        data = {
+            "video": {
+                "bitrateInfo": [
+                    {
+                        "GearName": "normal_720",
+                        "CodecType": "H265_hvc1",
+                        "Bitrate": 1500000,
+                        "PlayAddr": {"UrlList": ["https://a/1", "https://a/2"], "Width": 720},
+                    },
+                    {"GearName": "lowest", "CodecType": "h264", "play_addr": "https://a/3"},
+                ],
+                "downloadAddr": "https://a/2",
+            },
+            "author": {"uniqueId": "someone"},
+        }
+        response = ext._parse_video_data(data, "1")
+        assert [f.url for f in response.formats] == ["https://a/2", "https://a/3"]
+        first = response.formats[0]
+        assert (first.width, first.height, first.vcodec, first.tbr) == (720, None, "h265", 1500)
+        assert response.formats[1].vcodec == "h264"
+
+
+class TestSoundCloudClientId:
+    async def test_reuses_known_id_when_version_unchanged(self, monkeypatch):
+        from app.core.cache import TTLCache
+        from app.extractors.soundcloud import SoundCloudExtractor
+
+        monkeypatch.setattr(SoundCloudExtractor, "_client_id_cache", TTLCache(maxsize=1))
+        monkeypatch.setattr(SoundCloudExtractor, "_known_client_id", None)
+        cid = "a" * 32
+        fetched = []
+
+        async def fake_download(url, headers=None):
+            fetched.append(url)
+            if url.endswith(".js"):
+                return f'client_id:"{cid}"'
+            return '__sc_version="123" <script src="https://a-v2.sndcdn.com/assets/app.js">'
+
+        ext = get_extractor(Platform.SOUNDCLOUD)
+        monkeypatch.setattr(ext, "_download_webpage", fake_download)
+        assert await ext._get_client_id() == cid
+        assert await ext._get_client_id() == cid
+        assert len(fetched) == 2
+
+        # Cache entry expired, deploy unchanged: only the homepage is refetched
+        SoundCloudExtractor._client_id_cache.clear()
+        fetched.clear()
+        assert await ext._get_client_id() == cid
+        assert fetched == ["https://soundcloud.com"]
+
+    @pytest.mark.parametrize(
+        "script", ['client_id:"' + "b" * 32 + '"', "?client_id=" + "b" * 32 + "&x=1"]
+    )
+    async def test_script_scan_finds_client_id(self, monkeypatch, script):
+        from app.extractors.soundcloud import _SC_HEADERS
+
+        ext = get_extractor(Platform.SOUNDCLOUD)
+        scripts = {
+            "https://a-v2.sndcdn.com/a.js": "no id here",
+            "https://a-v2.sndcdn.com/b.js": script,
+        }
+        requested = []
+
+        async def fake_download(url, headers=None):
+            requested.append((url, headers))
+            return scripts[url]
+
+        monkeypatch.setattr(ext, "_download_webpage", fake_download)
+        assert await ext._scan_scripts(list(scripts)) == "b" * 32
+        user_agent = {"User-Agent": _SC_HEADERS["User-Agent"]}
+        assert sorted(requested) == [(url, user_agent) for url in scripts]
+
+
+class TestTwitchVod:
+    async def test_token_and_metadata_in_one_request(self, monkeypatch):
+        import httpx
+
+        ext = get_extractor(Platform.TWITCH)
+        posts = []
+
+        async def fake_post(url, headers=None, json=None):
+            posts.append(json)
+            return httpx.Response(
+                200,
+                json=[
+                    {"data": {"videoPlaybackAccessToken": {"signature": "s", "value": "t"}}},
+                    {"data": {"video": {"title": "A VOD", "lengthSeconds": 60}}},
+                ],
+            )
+
+        async def fake_download(url, **kwargs):
+            return "#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=1000,RESOLUTION=1280x720\nhttps://v/720.m3u8\n"
+
+        monkeypatch.setattr(ext.http, "post", fake_post)
+        monkeypatch.setattr(ext, "_download_webpage", fake_download)
+        response = await ext._extract_vod("123", "https://www.twitch.tv/videos/123")
+        assert len(posts) == 1
+        assert [op["operationName"] for op in posts[0]] == ["PlaybackAccessToken", "VideoMetadata"]
+        assert (response.title, response.duration) == ("A VOD", 60.0)
+        assert response.formats[0].height == 720
+
+    def test_parse_hls_playlist(self):
+        ext = get_extractor(Platform.TWITCH)
+        playlist = (
+            "#EXTM3U\r\n"
+            '#EXT-X-MEDIA:TYPE=VIDEO,GROUP-ID="chunked",NAME="1080p60"\r\n'
+            '#EXT-X-STREAM-INF:BANDWIDTH=6000000,RESOLUTION=1920x1080,VIDEO="chunked"\r\n'
+            "https://v/chunked.m3u8\r\n"
+            "#EXT-X-STREAM-INF:BANDWIDTH=160000\r\n"
+            "https://v/audio.m3u8\r\n"
+            "#EXT-X-STREAM-INF:BANDWIDTH=1\r\n"
+        )
+        formats = ext._parse_hls_playlist(playlist, "https://usher/vod.m3u8")
+        assert [(f.format_id, f.width, f.height, f.tbr) for f in formats] == [
+            ("chunked", 1920, 1080, 6000.0),
+            ("unknown", None, None, 160.0),
+        ]
+
+
+class TestTwitterParse:
+    def test_parse_tweet_video_and_photo(self):
+        ext = get_extractor(Platform.TWITTER)
+        tweet = {
+            "core": {"user_results": {"result": {"legacy": {"screen_name": "someone"}}}},
+            "legacy": {
+                "full_text": "hello",
+                "extended_entities": {
+                    "media": [
+                        {
+                            "type": "video",
+                            "media_url_https": "https://pbs/thumb.jpg",
+                            "video_info": {
+                                "duration_millis": 12500,
+                                "variants": [
+                                    {
+                                        "content_type": "application/x-mpegURL",
+                                        "url": "https://v/pl.m3u8",
+                                    },
+                                    {
+                                        "content_type": "video/mp4",
+                                        "bitrate": 832000,
+                                        "url": "https://v/vid/640x360/a.mp4?tag=12",
+                                    },
+                                ],
+                            },
+                        },
+                        {"type": "photo", "media_url_https": "https://pbs/media/p.jpg?x=1"},
+                    ]
+                },
+            },
+        }
+        response = ext._parse_tweet(tweet, "1")
+        assert response.duration == 12.5
+        assert response.thumbnail == "https://pbs/thumb.jpg"
+        video, photo = response.formats
+        assert (video.width, video.height, video.tbr) == (640, 360, 832.0)
+        assert photo.url == "https://pbs/media/p.jpg?format=jpg&name=orig"
+
+    def test_parse_tweet_gif_is_video_only(self):
+        ext = get_extractor(Platform.TWITTER)
+        gif = {
+            "type": "animated_gif",
+            "video_info": {"variants": [{"content_type": "video/mp4", "url": "https://v/g.mp4"}]},
+        }
+        response = ext._parse_tweet({"legacy": {"extended_entities": {"media": [gif]}}}, "1")
+        (fmt,) = response.formats
+        assert (fmt.ext, fmt.vcodec, fmt.acodec) == ("mp4", "avc1", "none")
+        assert fmt.format_type == FormatType.VIDEO_ONLY
+
+
+class TestTwitterGuestToken:
+    async def test_token_shared_until_rejected(self, monkeypatch):
+        import httpx
+
+        from app.core.cache import TTLCache
+        from app.extractors.twitter import TwitterExtractor
+
+        monkeypatch.setattr(TwitterExtractor, "_guest_token_cache", TTLCache(maxsize=1))
+        activations = []
+
+        async def fake_post(url, headers=None):
+            activations.append(url)
+            return httpx.Response(200, json={"guest_token": f"g{len(activations)}"})
+
+        async def fake_get(url, headers=None, params=None):
+            return httpx.Response(403)
+
+        first, second = get_extractor(Platform.TWITTER), get_extractor(Platform.TWITTER)
+        for ext in (first, second):
+            monkeypatch.setattr(ext.http, "post", fake_post)
+            monkeypatch.setattr(ext.http, "get", fake_get)
+        assert await first._get_guest_token() == "g1"
+        assert await second._get_guest_token() == "g1"
+        assert len(activations) == 1
+
+        with pytest.raises(ExtractionError):
+            await second._fetch_graphql("1")
+        assert await first._get_guest_token() == "g2"
+
+
+class TestVimeoBearerToken:
+    async def test_token_shared_and_fetched_once(self, monkeypatch):
+        import asyncio
+
+        import httpx
+
+        from app.core.cache import TTLCache
+        from app.extractors.vimeo import VimeoExtractor
+
+        monkeypatch.setattr(VimeoExtractor, "_token_cache", TTLCache(maxsize=4))
+        posts = []
+
+        async def fake_post(url, headers=None, data=None):
+            posts.append(headers["Authorization"])
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"access_token": f"t{len(posts)}"})
+
+        extractors = [get_extractor(Platform.VIMEO) for _ in range(3)]
+        for ext in extractors:
+            monkeypatch.setattr(ext.http, "post", fake_post)
+        tokens = await asyncio.gather(*(ext._get_bearer_token() for ext in extractors))
+        assert tokens == ["t1"] * 3
+        assert len(posts) == 1
+        assert posts[0].startswith("Basic ")
+
+        assert await extractors[0]._get_bearer_token(force_refresh=True) == "t2"
+        assert await extractors[1]._get_bearer_token() == "t2"
+
+    async def test_failed_fetch_is_not_cached(self, monkeypatch):
+        import httpx
+
+        from app.core.cache import TTLCache
+        from app.extractors.vimeo import VimeoExtractor
+
+        monkeypatch.setattr(VimeoExtractor, "_token_cache", TTLCache(maxsize=4))
+        statuses = [401, 200]
+
+        async def fake_post(url, headers=None, data=None):
+            return httpx.Response(statuses.pop(0), json={"access_token": "t"})
+
+        ext = get_extractor(Platform.VIMEO)
+        monkeypatch.setattr(ext.http, "post", fake_post)
+        assert await ext._get_bearer_token() is None
+        assert await ext._get_bearer_token() == "t"
+
+    async def test_token_keyed_by_credentials(self, monkeypatch):
+        import httpx
+
+        from app.core.cache import TTLCache
+        from app.extractors import vimeo
+        from app.extractors.vimeo import VimeoExtractor
+
+        monkeypatch.setattr(VimeoExtractor, "_token_cache", TTLCache(maxsize=4))
+        secret = ["one"]
+        settings = vimeo.get_settings()
+        monkeypatch.setattr(
+            vimeo,
+            "get_settings",
+            lambda: settings.model_copy(
+                update={"vimeo_client_id": "app", "vimeo_client_secret": secret[0]}
+            ),
+        )
+        posts = []
+
+        async def fake_post(url, headers=None, data=None):
+            posts.append(headers["Authorization"])
+            return httpx.Response(200, json={"access_token": f"t{len(posts)}"})
+
+        ext = get_extractor(Platform.VIMEO)
+        monkeypatch.setattr(ext.http, "post", fake_post)
+        assert await ext._get_bearer_token() == "t1"
+        secret[0] = "two"
+        assert await ext._get_bearer_token() == "t2"
+        assert posts[0] != posts[1]
+
+
+class TestVimeoParse:
+    async def test_parse_hls_master(self, monkeypatch):
+        ext = get_extractor(Platform.VIMEO)
+        playlist = (
+            "#EXTM3U\r\n"
+            '#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="audio",URI="audio.m3u8"\r\n'
+            '#EXT-X-STREAM-INF:BANDWIDTH=2500000,RESOLUTION=1280x720,CODECS="avc1,mp4a"\r\n'
+            "720.m3u8\r\n"
+            "#EXT-X-STREAM-INF:BANDWIDTH=800000\r\n"
+            "https://cdn/low.m3u8\r\n"
+        )
+
+        async def fake_download(url, **kwargs):
+            return playlist
+
+        monkeypatch.setattr(ext, "_download_webpage", fake_download)
+        formats = await ext._parse_hls_master("https://cdn/v/master.m3u8")
+        assert [(f.url, f.format_id, f.width, f.height, f.tbr) for f in formats] == [
+            ("https://cdn/v/720.m3u8", "hls_720p", 1280, 720, 2500.0),
+            ("https://cdn/low.m3u8", "hls", None, None, 800.0),
+        ]
+
+    async def test_parse_video_progressive_sources(self, monkeypatch):
+        ext = get_extractor(Platform.VIMEO)
+
+        async def fake_resolve(url):
+            return url.replace("progressive_redirect", "cdn")
+
+        monkeypatch.setattr(ext.http, "resolve_redirect", fake_resolve)
+        data = {
+            "name": "Clip",
+            "user": {"name": "Someone", "uri": "/users/7"},
+            "metadata": {"connections": {"likes": {"total": 5}, "comments": {}}},
+            "tags": [{"name": "music"}, {"name": ""}, {"tag": "x"}],
+            "files": [{"link": "https://v/f.webm", "type": "video/webm", "quality": "hd"}],
+            "download": [{"link": "https://v/d.mp4", "quality": "sd", "size": 10}],
+            "play": {
+                "progressive": [
+                    {"url": "https://v/progressive_redirect/p.mp4", "height": 540, "fps": 25},
+                    {"link": "https://v/cdn/p.mp4", "height": 540},
+                    {"link": "https://v/d.mp4", "quality": "sd"},
+                    {"height": 360},
+                ]
+            },
+        }
+        response = await ext._parse_video(data, "1", "token")
+        assert [(f.format_id, f.ext, f.url) for f in response.formats] == [
+            ("hd", "webm", "https://v/f.webm"),
+            ("download_sd", "mp4", "https://v/d.mp4"),
+            ("progressive_540p", "mp4", "https://v/cdn/p.mp4"),
+        ]
+        assert response.formats[1].filesize == 10
+        assert response.formats[2].fps == 25.0
+        meta = response.metadata
+        assert (meta.uploader, meta.uploader_id, meta.like_count) == ("Someone", "/users/7", 5)
+        assert meta.comment_count is None
+        assert (meta.tags, meta.categories) == (["music"], [])
+
+    async def test_background_requests_cancelled_on_error(self, monkeypatch):
+        import asyncio
+
+        ext = get_extractor(Platform.VIMEO)
+        cancelled = []
+
+        async def slow_hls(url):
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+
+        async def broken_config(url):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(ext, "_parse_hls_master", slow_hls)
+        monkeypatch.setattr(ext, "_config_cdn_formats", broken_config)
+        data = {"play": {"hls": {"link": "https://v/master.m3u8"}}, "config_url": "https://v/c"}
+        with pytest.raises(RuntimeError):
+            await ext._parse_video(data, "1", "token")
+        await asyncio.sleep(0)
+        assert cancelled == ["https://v/master.m3u8"]
+
+    async def test_hls_master_overlaps_redirects(self, monkeypatch):
+        import asyncio
+
+        ext = get_extractor(Platform.VIMEO)
+        hls_started = asyncio.Event()
+
+        async def fake_download(url, **kwargs):
+            hls_started.set()
+            return "#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=1000,RESOLUTION=640x360\n360.m3u8\n"
+
+        async def fake_resolve(url):
+            # Only completes if the HLS master was requested concurrently
+            await hls_started.wait()
+            return "https://cdn/p.mp4"
+
+        monkeypatch.setattr(ext, "_download_webpage", fake_download)
+        monkeypatch.setattr(ext.http, "resolve_redirect", fake_resolve)
+        data = {
+            "play": {
+                "hls": {"link": "https://cdn/master.m3u8"},
+                "progressive": [{"url": "https://v/progressive_redirect/p", "height": 360}],
+            }
+        }
+        response = await asyncio.wait_for(ext._parse_video(data, "1", "token"), 1)
+        assert [f.format_id for f in response.formats] == ["progressive_360p", "hls_360p"]
+
+    @pytest.mark.parametrize(
+        "status,body,error_code",
+        [
+            (403, {}, "vimeo.forbidden"),
+            (404, {}, "vimeo.not_found"),
+            (404, {"error_code": 5460}, "vimeo.login_required"),
+            (400, {"invalid_parameters": [{"field": "password"}]}, "vimeo.password_required"),
+            (400, [], "vimeo.api_error"),
+            (500, {}, "vimeo.api_error"),
+        ],
+    )
+    async def test_api_status_errors(self, monkeypatch, status, body, error_code):
+        import httpx
+
+        from app.models.request import ExtractRequest
+
+        ext = get_extractor(Platform.VIMEO)
+
+        async def fake_token(force_refresh=False):
+            return "token"
+
+        async def fake_get(url, headers=None, params=None):
+            return httpx.Response(status, json=body)
+
+        monkeypatch.setattr(ext, "_get_bearer_token", fake_token)
+        monkeypatch.setattr(ext.http, "get", fake_get)
+        request = ExtractRequest(url="https://vimeo.com/1")
+        with pytest.raises(ExtractionError) as exc_info:
+            await ext._extract("1", request.url, request, {})
+        assert exc_info.value.error_code == error_code
+
+    @pytest.mark.parametrize(
+        "all_qualities,expected",
+        [(False, ["progressive_720p", "hls"]), (True, ["progressive_720p", "hls_1080p"])],
+    )
+    async def test_hls_master_skipped_when_progressive_covers_source(
+        self, monkeypatch, all_qualities, expected
+    ):
+        ext = get_extractor(Platform.VIMEO)
+        downloads = []
+
+        async def fake_download(url, **kwargs):
+            downloads.append(url)
+            return "#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=1000,RESOLUTION=1920x1080\n1080.m3u8\n"
+
+        monkeypatch.setattr(ext, "_download_webpage", fake_download)
+        data = {
+            "height": 720,
+            "play": {
+                "hls": {"link": "https://cdn/master.m3u8"},
+                "progressive": [{"url": "https://cdn/720.mp4", "height": 720}],
+            },
+        }
+        response = await ext._parse_video(data, "1", "token", all_qualities=all_qualities)
+        assert [f.format_id for f in response.formats] == expected
+        assert len(downloads) == int(all_qualities)
+
+    async def test_config_cdns_expanded_concurrently(self, monkeypatch):
+        ext = get_extractor(Platform.VIMEO)
+        config = {
+            "request": {
+                "files": {
+                    "hls": {
+                        "cdns": {
+                            "akfire": {"url": "https://a/master.m3u8"},
+                            "fastly": {"url": "https://f/broken.m3u8"},
+                        }
+                    },
+                    "dash": {"cdns": {"akfire": {"url": "https://a/manifest.mpd"}}},
+                }
+            }
+        }
+
+        async def fake_json(url, **kwargs):
+            return config
+
+        async def fake_download(url, **kwargs):
+            if url.endswith("broken.m3u8"):
+                raise ValueError("boom")
+            if url.endswith(".mpd"):
+                raise ValueError("bad manifest")
+            return "#EXT-X-STREAM-INF:BANDWIDTH=1000,RESOLUTION=640x360\n360.m3u8\n"
+
+        monkeypatch.setattr(ext, "_download_json", fake_json)
+        monkeypatch.setattr(ext, "_download_webpage", fake_download)
+        formats = await ext._config_cdn_formats("https://player.vimeo.com/video/1/config")
+        assert [(f.format_id, f.protocol) for f in formats] == [
+            ("hls_akfire_hls_360p", "hls"),
+            ("hls_fastly", "hls"),
+            ("dash_akfire", "dash"),
+        ]
+
+    @pytest.mark.parametrize(
+        "page",
+        [
+            '<div data-config-url="https://player.vimeo.com/video/1/config?a=1&amp;b=2"></div>',
+            '{"config_url":"https:\\/\\/player.vimeo.com\\/video\\/1\\/config?a=1\\u0026b=2"}',
+        ],
+    )
+    async def test_config_url_from_player_page(self, monkeypatch, page):
+        ext = get_extractor(Platform.VIMEO)
+        requested = []
+
+        async def fake_download(url, **kwargs):
+            return page
+
+        async def fake_json(url, headers=None):
+            requested.append((url, headers["Referer"]))
+            if headers["Referer"] != "https://vimeo.com/":
+                raise ValueError("403")
+            return {"request": {"files": {"progressive": [{"url": "https://cdn/1.mp4"}]}}}
+
+        monkeypatch.setattr(ext, "_download_webpage", fake_download)
+        monkeypatch.setattr(ext, "_download_json", fake_json)
+        response = await ext._extract_from_player_config("1")
+        config_url = "https://player.vimeo.com/video/1/config?a=1&b=2"
+        assert sorted(requested) == [
+            (config_url, "https://player.vimeo.com/video/1"),
+            (config_url, "https://vimeo.com/"),
+        ]
+        assert response.formats[0].url == "https://cdn/1.mp4"
@@ -1,18 +1,23 @@
 """Tests for utility helpers."""
 
+import json
+
 import pytest
 
 from app.utils.helpers import (
     clean_html,
+    extract_json_any,
     float_or_none,
     format_date,
     int_or_none,
+    json_loads,
     parse_m3u8_attributes,
     parse_resolution,
     sanitize_filename,
     sort_formats,
     str_or_none,
     traverse_obj,
+    unescape_js_url,
     url_or_none,
 )
 
@@ -111,6 +116,42 @@ class TestCleanHtml:
     def test_decodes_entities(self):
         assert clean_html("&amp; &lt; &gt;") == "& < >"
 
+    def test_plain_text_is_stripped(self):
+        assert clean_html("  just text \n") == "just text"
+
+
+class TestUnescapeJsUrl:
+    def test_slashes_and_unicode_escapes(self):
+        raw = r"https:\/\/cdn.example.com\u002Fv.mp4?a=1\u0026b=2"
+        assert unescape_js_url(raw) == "https://cdn.example.com/v.mp4?a=1&b=2"
+
+    def test_plain_url_unchanged(self):
+        url = "https://cdn.example.com/v.mp4?a=1&b=2"
+        assert unescape_js_url(url) is url
+
+
+class TestExtractJsonAny:
+    NAMES = ("__UNIVERSAL_DATA_FOR_REHYDRATION__", "SIGI_STATE")
+
+    def test_script_tag(self):
+        html = (
+            '<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">'
+            '{"a": 1}</script>'
+        )
+        assert extract_json_any(html, self.NAMES) == {"a": 1}
+
+    def test_assignment_with_trailing_code(self):
+        html = '<script>window.SIGI_STATE = {"b": "};"}; init();</script>'
+        assert extract_json_any(html, self.NAMES) == {"b": "};"}
+
+    def test_skips_mentions_and_bad_payloads(self):
+        html = (
+            "<p>SIGI_STATE</p><script id=SIGI_STATE>not json</script>"
+            "<script>__UNIVERSAL_DATA_FOR_REHYDRATION__ = [1, 2]</script>"
+        )
+        assert extract_json_any(html, self.NAMES) == [1, 2]
+        assert extract_json_any("<p>nothing</p>", self.NAMES) is None
+
 
 class TestParseResolution:
     def test_1080p(self):
@@ -166,3 +207,16 @@ class TestParseM3U8Attributes:
         assert attrs["BANDWIDTH"] == "2000000"
         assert attrs["RESOLUTION"] == "1280x720"
         assert attrs["CODECS"] == "avc1.4d401f,mp4a.40.2"
+
+
+class TestJsonLoads:
+    def test_str_and_bytes(self):
+        assert json_loads('{"a": [1, 2]}') == {"a": [1, 2]}
+        assert json_loads(b'{"a": "\\u00e9"}') == {"a": "é"}
+
+    def test_lenient_input_still_parses(self):
+        assert json_loads('{"a": "\\ud800"}') == {"a": "\ud800"}
+
+    def test_invalid_raises_json_decode_error(self):
+        with pytest.raises(json.JSONDecodeError):
+            json_loads(b"{not json")
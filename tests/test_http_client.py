@@ -1,11 +1,16 @@
 """Tests for HTTP client retry and cookie logic."""
 
+import httpx
+
 from app.core.http_client import (
+    _ACCEPT_ENCODING,
     _MAX_BACKOFF,
     _NETWORK_ERRORS,
     _RETRYABLE_STATUS_CODES,
     HTTPClient,
+    close_shared_transport,
     get_random_user_agent,
+    get_shared_transport,
 )
 
 
@@ -54,6 +59,12 @@ class TestClientInit:
         client = HTTPClient()
         assert "User-Agent" in client._default_headers
 
+    def test_accept_encoding_only_lists_decodable_codings(self):
+        client = HTTPClient()
+        assert client._default_headers["Accept-Encoding"] == _ACCEPT_ENCODING
+        assert "gzip" in _ACCEPT_ENCODING
+        assert ("br" in _ACCEPT_ENCODING) is ("br" in httpx._decoders.SUPPORTED_DECODERS)
+
     def test_custom_headers_override(self):
         client = HTTPClient(headers={"X-Custom": "test"})
         assert client._default_headers["X-Custom"] == "test"
@@ -78,3 +89,54 @@ class TestUserAgent:
         from app.core.http_client import _USER_AGENTS
 
         assert len(_USER_AGENTS) >= 3
+
+
+class TestSharedTransport:
+    async def test_clients_share_transport(self):
+        a = await HTTPClient()._get_client()
+        b = await HTTPClient()._get_client()
+        assert a._transport is b._transport is get_shared_transport()
+        await a.aclose()
+        await b.aclose()
+
+    async def test_client_close_keeps_pool(self):
+        transport = get_shared_transport()
+        client = HTTPClient()
+        await client._get_client()
+        await client.close()
+        assert get_shared_transport() is transport
+        await close_shared_transport()
+        assert get_shared_transport() is not transport
+        await close_shared_transport()
+
+
+class TestStream:
+    async def test_retries_retryable_status_before_yielding(self, monkeypatch):
+        statuses = [503, 200]
+
+        def handler(request):
+            return httpx.Response(statuses.pop(0), content=b"body")
+
+        monkeypatch.setattr(HTTPClient, "_backoff", staticmethod(lambda attempt, response=None: 0))
+        client = HTTPClient(max_retries=2)
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client.stream("GET", "https://example.com/") as response:
+            assert response.status_code == 200
+            assert await response.aread() == b"body"
+        assert statuses == []
+        await client.close()
+
+    async def test_gives_up_after_max_retries(self, monkeypatch):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(429)
+
+        monkeypatch.setattr(HTTPClient, "_backoff", staticmethod(lambda attempt, response=None: 0))
+        client = HTTPClient(max_retries=1)
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client.stream("GET", "https://example.com/") as response:
+            assert response.status_code == 429
+        assert len(calls) == 2
+        await client.close()
@@ -46,6 +46,8 @@ class TestExtractRequest:
         assert req.subtitle_lang is None
         assert req.cookie_file is None
         assert req.password is None
+        assert req.all_qualities is False
+        assert req.include_sizes is False
 
     def test_full(self):
         req = ExtractRequest(